@@ -1,13 +1,6 @@
 """Run the supervisor service."""
 
-import uvicorn
-
-from supervisor.config import config
+from supervisor.__main__ import main
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "supervisor.main:app",
-        host=config.host,
-        port=config.port,
-        reload=False,
-    )
+    main()
@@ -1,21 +1,43 @@
 """
 Entry point for running supervisor via `python -m supervisor`.
 
-Starts the FastAPI server with uvicorn.
+Starts the FastAPI server with uvicorn, using the uvloop event loop and
+httptools HTTP parser when they are installed (via uvicorn[standard]).
 """
 
 import uvicorn
 
-from .config import HOST, PORT
+from .config import config
+
+
+def _pick_loop() -> str:
+    """Prefer uvloop, falling back to the stdlib asyncio loop."""
+    try:
+        import uvloop  # noqa: F401
+        return "uvloop"
+    except ImportError:
+        return "asyncio"
+
+
+def _pick_http() -> str:
+    """Prefer the httptools parser, falling back to h11."""
+    try:
+        import httptools  # noqa: F401
+        return "httptools"
+    except ImportError:
+        return "h11"
 
 
 def main():
     """Run the supervisor server."""
     uvicorn.run(
         "supervisor.main:app",
-        host=HOST,
-        port=PORT,
+        host=config.host,
+        port=config.port,
+        loop=_pick_loop(),
+        http=_pick_http(),
         reload=False,
+        workers=1,
     )
 
 
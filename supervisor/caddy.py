@@ -10,17 +10,60 @@ The main Caddyfile should include:
 """
 
 import asyncio
+import hashlib
+import io
 import logging
-import subprocess
+import os
 from pathlib import Path
 
 import httpx
 
 from .config import config
-from .models import Service
+from .models import Service, run_db
 
 logger = logging.getLogger(__name__)
 
+# Message returned by write_supervisor_config when the file is already current
+CONFIG_UNCHANGED = "Config unchanged"
+
+# Hash of the content Caddy last reloaded successfully, so identical rewrites
+# (and reloads) are skipped; cleared when a reload fails so the next one retries
+_applied_content_hash: bytes | None = None
+# Hash of the content last written, promoted to applied once a reload succeeds
+_written_content_hash: bytes | None = None
+
+# Reload requests arriving within this window share a single reload
+RELOAD_DEBOUNCE_SECONDS = 0.5
+_reload_future: asyncio.Future | None = None
+_reload_task: asyncio.Task | None = None
+_reload_forced = False  # Set when a caller in the current window wants force
+
+# Shared client for the Caddy admin API (keeps connections alive between calls)
+_caddy_http: httpx.AsyncClient | None = None
+_caddy_http_lock = asyncio.Lock()
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """Get the shared admin API client, creating it on first use."""
+    global _caddy_http
+    async with _caddy_http_lock:
+        if _caddy_http is None or _caddy_http.is_closed:
+            _caddy_http = httpx.AsyncClient(
+                base_url=config.caddy_admin_url,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                timeout=httpx.Timeout(10.0, connect=2.0),
+            )
+        return _caddy_http
+
+
+async def close_client():
+    """Close the shared admin API client (called on shutdown)."""
+    global _caddy_http
+    async with _caddy_http_lock:
+        if _caddy_http is not None:
+            await _caddy_http.aclose()
+            _caddy_http = None
+
 
 def generate_supervisor_caddyfile(services: list[Service] = None) -> str:
     """
@@ -30,69 +73,109 @@ def generate_supervisor_caddyfile(services: list[Service] = None) -> str:
     Falls back to path-based routing if caddy_subdomain is not set but caddy_path is.
     """
     if services is None:
-        services = Service.select().where(Service.expose_caddy == True)
+        # Only the routing columns are needed; stream rows without caching them
+        services = (
+            Service.select(
+                Service.name,
+                Service.port,
+                Service.expose_caddy,
+                Service.caddy_subdomain,
+                Service.caddy_path,
+            )
+            .where(Service.expose_caddy == True)
+            .iterator()
+        )
 
-    lines = [
-        "# Supervisor-managed services",
-        "# Auto-generated - do not edit manually",
-        "",
-    ]
+    base_domain = config.caddy_base_domain
+    port = config.caddy_port
 
-    subdomain_services = []
-    path_services = []
+    buf = io.StringIO()
+    buf.write("# Supervisor-managed services\n# Auto-generated - do not edit manually\n")
 
+    # Subdomain blocks are written in a single pass; path-based services are
+    # collected and listed afterwards
+    path_services = []
     for service in services:
         if not service.expose_caddy or not service.port:
             continue
 
         if service.caddy_subdomain:
-            subdomain_services.append(service)
+            buf.write(
+                f"\n{service.caddy_subdomain}.{base_domain}:{port} {{\n"
+                f"\treverse_proxy http://localhost:{service.port}\n"
+                "}\n"
+            )
         elif service.caddy_path:
             path_services.append(service)
 
-    # Generate subdomain blocks
-    for service in subdomain_services:
-        subdomain = service.caddy_subdomain
-        domain = f"{subdomain}.{config.caddy_base_domain}:{config.caddy_port}"
-        lines.extend([
-            f"{domain} {{",
-            f"\treverse_proxy http://localhost:{service.port}",
-            "}",
-            "",
-        ])
-
     # Generate path-based routing (legacy support) - grouped under main domain
     if path_services:
-        lines.extend([
-            f"# Path-based routes on {config.caddy_domain}",
-            f"# (Add these to your main domain block manually or via import)",
-        ])
+        buf.write(
+            f"\n# Path-based routes on {config.caddy_domain}\n"
+            "# (Add these to your main domain block manually or via import)"
+        )
         for service in path_services:
             path = service.caddy_path.rstrip("/")
-            lines.extend([
-                f"# {service.name}: handle {path}/* -> localhost:{service.port}",
-            ])
+            buf.write(f"\n# {service.name}: handle {path}/* -> localhost:{service.port}")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def write_supervisor_config() -> tuple[bool, str]:
+def _atomic_write(path: Path, data: bytes):
+    """
+    Write a file via a temp file and rename so readers never see partial content.
+
+    Falls back to writing in place if the directory doesn't allow creating
+    the temp file (e.g. only the file itself is writable).
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    except PermissionError:
+        path.write_bytes(data)
+        return
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def write_supervisor_config(force: bool = False) -> tuple[bool, str]:
     """
     Write the supervisor Caddyfile to the configured path.
 
+    Skips the write if the content is identical to what Caddy last reloaded
+    successfully, unless force is set.
+
     Returns:
-        Tuple of (success, message)
+        Tuple of (success, message); message is CONFIG_UNCHANGED if skipped
     """
+    global _written_content_hash
     config_path = Path(config.caddy_supervisor_file)
 
     try:
         content = generate_supervisor_caddyfile()
 
+        content_hash = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        if not force and content_hash == _applied_content_hash and config_path.exists():
+            logger.debug(f"Caddy config at {config_path} is unchanged")
+            return True, CONFIG_UNCHANGED
+
         # Ensure parent directory exists
         config_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write config file
-        config_path.write_text(content)
+        _atomic_write(config_path, content.encode())
+        _written_content_hash = content_hash
         logger.info(f"Wrote Caddy config to {config_path}")
 
         return True, f"Config written to {config_path}"
@@ -107,51 +190,76 @@ def write_supervisor_config() -> tuple[bool, str]:
         return False, error
 
 
-async def reload_caddy() -> tuple[bool, str]:
+async def _run_command(*args: str, timeout: float) -> tuple[int, str]:
+    """
+    Run a command on the event loop and wait for it to finish.
+
+    Returns (returncode, stderr). Kills the process and raises
+    asyncio.TimeoutError if it runs longer than timeout seconds.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stderr.decode("utf-8", errors="replace")
+
+
+async def reload_caddy(force: bool = False) -> tuple[bool, str]:
     """
     Write supervisor config and reload Caddy.
 
     Writes to the auxiliary config file and reloads Caddy using systemctl.
+    The reload is skipped if the content matches the last successful reload,
+    unless force is set.
 
     Returns:
         Tuple of (success, message)
     """
-    # First write the config file
-    success, message = write_supervisor_config()
+    global _applied_content_hash
+    # First write the config file (queries the DB, so run off the event loop)
+    success, message = await run_db(write_supervisor_config, force)
     if not success:
         return False, message
+    if message == CONFIG_UNCHANGED:
+        return True, "Configuration unchanged, reload skipped"
+
+    result = await _reload_caddy_service()
+    # Only a successful reload makes the written content current
+    _applied_content_hash = _written_content_hash if result[0] else None
+    return result
+
 
-    # Try to reload Caddy via systemctl
+async def _reload_caddy_service() -> tuple[bool, str]:
+    """Reload Caddy via systemctl, falling back to caddy reload, then the admin API."""
     try:
-        result = await asyncio.to_thread(
-            subprocess.run,
-            ["sudo", "systemctl", "reload", "caddy"],
-            capture_output=True,
-            text=True,
-            timeout=30,
+        returncode, _ = await _run_command(
+            "sudo", "systemctl", "reload", "caddy", timeout=30
         )
 
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("Caddy reloaded successfully via systemctl")
             return True, "Configuration written and Caddy reloaded"
         else:
             # Try caddy reload command as fallback
-            result = await asyncio.to_thread(
-                subprocess.run,
-                ["caddy", "reload", "--config", "/etc/caddy/Caddyfile"],
-                capture_output=True,
-                text=True,
-                timeout=30,
+            returncode, stderr = await _run_command(
+                "caddy", "reload", "--config", "/etc/caddy/Caddyfile", timeout=30
             )
-            if result.returncode == 0:
+            if returncode == 0:
                 logger.info("Caddy reloaded successfully via caddy reload")
                 return True, "Configuration written and Caddy reloaded"
             else:
-                error = f"Caddy reload failed: {result.stderr}"
+                error = f"Caddy reload failed: {stderr}"
                 logger.error(error)
                 return False, error
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         error = "Caddy reload timed out"
         logger.error(error)
         return False, error
@@ -164,6 +272,44 @@ async def reload_caddy() -> tuple[bool, str]:
         return False, error
 
 
+async def reload_caddy_debounced(
+    delay: float = RELOAD_DEBOUNCE_SECONDS, force: bool = False
+) -> tuple[bool, str]:
+    """
+    Write supervisor config and reload Caddy, coalescing concurrent requests.
+
+    The first caller schedules a reload after `delay` seconds; anyone calling
+    before it starts waits on the same result instead of triggering another.
+    The shared reload is forced if any of its callers asked for force.
+
+    Returns:
+        Tuple of (success, message)
+    """
+    global _reload_future, _reload_task, _reload_forced
+    if force:
+        _reload_forced = True
+    if _reload_future is None:
+        _reload_future = asyncio.get_running_loop().create_future()
+        _reload_task = asyncio.create_task(_delayed_reload(_reload_future, delay))
+    # Shield so a cancelled caller doesn't cancel the reload for everyone else
+    return await asyncio.shield(_reload_future)
+
+
+async def _delayed_reload(future: asyncio.Future, delay: float):
+    """Wait out the debounce window, then run a single reload."""
+    global _reload_future, _reload_forced
+    await asyncio.sleep(delay)
+    # Requests from here on start a new window
+    _reload_future = None
+    force, _reload_forced = _reload_forced, False
+    try:
+        result = await reload_caddy(force=force)
+    except Exception as e:
+        logger.error(f"Error reloading Caddy: {e}")
+        result = (False, f"Error reloading Caddy: {e}")
+    future.set_result(result)
+
+
 async def reload_caddy_via_api() -> tuple[bool, str]:
     """
     Reload Caddy via the admin API.
@@ -172,22 +318,22 @@ async def reload_caddy_via_api() -> tuple[bool, str]:
     if the main Caddyfile imports the supervisor config.
     """
     try:
-        async with httpx.AsyncClient() as client:
-            # Tell Caddy to reload its config file
-            response = await client.post(
-                f"{config.caddy_admin_url}/load",
-                headers={"Content-Type": "text/caddyfile"},
-                content=Path("/etc/caddy/Caddyfile").read_text(),
-                timeout=30.0,
-            )
+        client = await _get_client()
+        # Tell Caddy to reload its config file
+        response = await client.post(
+            "/load",
+            headers={"Content-Type": "text/caddyfile"},
+            content=Path("/etc/caddy/Caddyfile").read_text(),
+            timeout=30.0,
+        )
 
-            if response.status_code == 200:
-                logger.info("Caddy reloaded via admin API")
-                return True, "Configuration reloaded via API"
-            else:
-                error = f"Caddy API reload failed: {response.text}"
-                logger.error(error)
-                return False, error
+        if response.status_code == 200:
+            logger.info("Caddy reloaded via admin API")
+            return True, "Configuration reloaded via API"
+        else:
+            error = f"Caddy API reload failed: {response.text}"
+            logger.error(error)
+            return False, error
 
     except httpx.ConnectError:
         error = f"Could not connect to Caddy admin API at {config.caddy_admin_url}"
@@ -202,14 +348,11 @@ async def reload_caddy_via_api() -> tuple[bool, str]:
 async def get_caddy_config() -> dict | None:
     """Fetch current Caddy configuration from admin API."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{config.caddy_admin_url}/config/",
-                timeout=10.0,
-            )
-            if response.status_code == 200:
-                return response.json()
-            return None
+        client = await _get_client()
+        response = await client.get("/config/", timeout=10.0)
+        if response.status_code == 200:
+            return response.json()
+        return None
     except Exception as e:
         logger.error(f"Error fetching Caddy config: {e}")
         return None
@@ -6,7 +6,7 @@ All persistent data is stored in ~/.supervisor/
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -34,11 +34,14 @@ class Config:
 
     # Service URLs - the host used in links to services (defaults to machine IP)
     service_host: str = os.environ.get("SERVICE_HOST", "")
+    _cached_service_host: str | None = field(default=None, repr=False)
 
     def get_service_host(self) -> str:
-        """Get the host to use in service URLs."""
+        """Get the host to use in service URLs (auto-detected once, then cached)."""
         if self.service_host:
             return self.service_host
+        if self._cached_service_host is not None:
+            return self._cached_service_host
         # Auto-detect local IP
         import socket
         try:
@@ -46,9 +49,14 @@ class Config:
             s.connect(("8.8.8.8", 80))
             ip = s.getsockname()[0]
             s.close()
-            return ip
         except Exception:
-            return "localhost"
+            ip = "localhost"
+        self._cached_service_host = ip
+        return ip
+
+    def invalidate_service_host(self):
+        """Forget the auto-detected host so it is re-detected on next use."""
+        self._cached_service_host = None
 
     # Caddy
     caddy_admin_url: str = os.environ.get("CADDY_ADMIN_URL", "http://localhost:2019")
@@ -64,10 +72,12 @@ class Config:
     # Auto-fix
     autofix_enabled: bool = os.environ.get("AUTOFIX_ENABLED", "true").lower() == "true"
     autofix_timeout: int = int(os.environ.get("AUTOFIX_TIMEOUT", "300"))
+    ai_max_concurrency: int = int(os.environ.get("AI_MAX_CONCURRENCY", "4"))  # Concurrent robot onboard/scan runs
 
     # Process management
     restart_delay: int = int(os.environ.get("RESTART_DELAY", "5"))
     max_restart_attempts: int = int(os.environ.get("MAX_RESTART_ATTEMPTS", "3"))
+    max_restart_backoff: int = int(os.environ.get("MAX_RESTART_BACKOFF", "60"))  # Cap on doubling delay
 
     def __post_init__(self):
         """Initialize derived paths and create directories."""
@@ -8,31 +8,59 @@ Failed jobs can trigger Robot auto-fix attempts.
 """
 
 import asyncio
+import functools
 import logging
 import os
 import shlex
-import subprocess
+import signal
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 import psutil
 from croniter import croniter
 
 from .config import config
-from .models import CronExecution, CronJob
+from .models import CronExecution, CronJob, run_db
 
 logger = logging.getLogger(__name__)
 
+# Job execution tuning
+MAX_SAMPLE_INTERVAL = 5.0  # Seconds between samples for long-running jobs
+CHILD_REFRESH_SECONDS = 5.0  # How often to re-enumerate child processes
+MAX_OUTPUT_BYTES = 1024 * 1024  # Keep at most the last 1MB of stdout/stderr
+ARGV_CACHE_SIZE = 256  # Max cached command splits before the cache is reset
+KILL_GRACE_SECONDS = 5.0  # Time between SIGTERM and SIGKILL when stopping a job
+
+
+async def _drain_stream(stream: asyncio.StreamReader, buf: bytearray):
+    """Read a pipe until EOF, keeping only the most recent MAX_OUTPUT_BYTES."""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        buf += chunk
+        if len(buf) > MAX_OUTPUT_BYTES:
+            del buf[: len(buf) - MAX_OUTPUT_BYTES]
+
 
 class CronManager:
     """Manages scheduled cron job execution."""
 
     def __init__(self):
-        self._running_jobs: dict[int, subprocess.Popen] = {}
+        self._running_jobs: dict[int, asyncio.subprocess.Process | None] = {}
         self._lock = threading.Lock()
         self._on_fix_needed: callable = None
+        # job id -> (schedule, next fire minute as Unix time); avoids
+        # re-parsing every tick
+        self._schedule_cache: dict[int, tuple[str, int]] = {}
+        # Snapshot of os.environ taken on first execution, shared by all jobs
+        self._base_env: dict[str, str] | None = None
+        # env file path -> (mtime, parsed vars)
+        self._env_file_cache: dict[Path, tuple[float, dict[str, str]]] = {}
+        # command string -> shlex.split result
+        self._argv_cache: dict[str, list[str]] = {}
 
     def set_fix_callback(self, callback: callable):
         """Set callback for triggering auto-fix: callback(cron_job, execution)."""
@@ -42,29 +70,52 @@ class CronManager:
         """Load environment variables from a .env file."""
         env = {}
         try:
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    # Skip comments and empty lines
-                    if not line or line.startswith("#"):
-                        continue
-                    # Handle export prefix
-                    if line.startswith("export "):
-                        line = line[7:]
-                    # Parse KEY=VALUE
-                    if "=" in line:
-                        key, _, value = line.partition("=")
-                        key = key.strip()
-                        value = value.strip()
-                        # Remove quotes if present
-                        if (value.startswith('"') and value.endswith('"')) or \
-                           (value.startswith("'") and value.endswith("'")):
-                            value = value[1:-1]
-                        env[key] = value
+            data = path.read_bytes()
         except Exception as e:
             logger.error(f"Error loading env file {path}: {e}")
+            return env
+
+        for line in data.splitlines():
+            line = line.strip()
+            # Skip comments and empty lines
+            if not line or line[:1] == b"#":
+                continue
+            # Handle export prefix
+            if line.startswith(b"export "):
+                line = line[7:]
+            # Parse KEY=VALUE
+            key, sep, value = line.partition(b"=")
+            if not sep:
+                continue
+            value = value.strip()
+            # Remove quotes if present
+            if len(value) >= 2 and value[:1] in (b'"', b"'") and value[-1:] == value[:1]:
+                value = value[1:-1]
+            env[key.strip().decode("utf-8", errors="replace")] = value.decode(
+                "utf-8", errors="replace"
+            )
         return env
 
+    def _get_env_file(self, path: Path) -> dict[str, str]:
+        """Load an env file, reusing the parsed result until its mtime changes."""
+        mtime = path.stat().st_mtime
+        cached = self._env_file_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        env = self._load_env_file(path)
+        self._env_file_cache[path] = (mtime, env)
+        return env
+
+    def _split_command(self, command: str) -> list[str]:
+        """Split a command into argv, caching the result per command string."""
+        argv = self._argv_cache.get(command)
+        if argv is None:
+            argv = shlex.split(command)
+            if len(self._argv_cache) >= ARGV_CACHE_SIZE:
+                self._argv_cache.clear()
+            self._argv_cache[command] = argv
+        return argv
+
     def get_next_run(self, schedule: str, base_time: datetime = None) -> datetime:
         """Calculate the next run time for a cron schedule."""
         if base_time is None:
@@ -76,23 +127,43 @@ class CronManager:
             logger.error(f"Invalid cron schedule '{schedule}': {e}")
             return None
 
-    def should_run_now(self, job: CronJob) -> bool:
-        """Check if a job should run at the current minute."""
-        now = datetime.now().replace(second=0, microsecond=0)
+    def should_run_now(self, job: CronJob, now_minute: int | None = None) -> bool:
+        """
+        Check if a job should run at the current minute.
+
+        now_minute is the Unix time of the start of the minute; tick() passes
+        one shared value for all jobs.
+        """
+        if now_minute is None:
+            now_minute = _current_minute()
+
+        # Reuse the cached fire time until it has passed or the schedule changes
+        cached = self._schedule_cache.get(job.id)
+        if cached and cached[0] == job.schedule and cached[1] >= now_minute:
+            return cached[1] == now_minute
+
         try:
-            cron = croniter(job.schedule, now - timedelta(minutes=1))
-            next_run = cron.get_next(datetime)
-            return next_run == now
+            cron = croniter(job.schedule, datetime.fromtimestamp(now_minute - 60))
+            next_minute = int(cron.get_next(datetime).timestamp())
         except (KeyError, ValueError) as e:
             logger.error(f"Invalid cron schedule for {job.name}: {e}")
             return False
 
-    def update_next_run(self, job: CronJob):
-        """Update the next_run field for a job."""
+        self._schedule_cache[job.id] = (job.schedule, next_minute)
+        return next_minute == now_minute
+
+    def update_next_run(self, job: CronJob, save: bool = True):
+        """Update the next_run field for a job.
+
+        With save=False only the instance is updated, for callers that save
+        it together with other changes.
+        """
+        self._schedule_cache.pop(job.id, None)
         next_run = self.get_next_run(job.schedule)
         if next_run:
             job.next_run = next_run
-            job.save()
+            if save:
+                job.save()
 
     async def tick(self) -> list[int]:
         """
@@ -100,15 +171,36 @@ class CronManager:
 
         Returns list of execution IDs that were started.
         """
-        execution_ids = []
-        jobs = CronJob.select().where(CronJob.enabled == True)
+        now_minute = _current_minute()
+
+        # Scan only the columns needed to decide what is due, then load the
+        # full rows for the (usually few) jobs that will actually run
+        candidates = await run_db(lambda: list(
+            CronJob.select(CronJob.id, CronJob.name, CronJob.schedule)
+            .where(CronJob.enabled == True)
+            .iterator()
+        ))
+        due_ids = [job.id for job in candidates if self.should_run_now(job, now_minute)]
+        if not due_ids:
+            return []
+
+        due = await run_db(lambda: list(
+            CronJob.select().where(CronJob.id.in_(due_ids)).order_by(CronJob.id)
+        ))
+        for job in due:
+            logger.info(f"Cron job {job.name} is due, executing")
+
+        # Run all due jobs concurrently so a slow job doesn't delay the rest
+        results = await asyncio.gather(
+            *(self.execute(job) for job in due), return_exceptions=True
+        )
 
-        for job in jobs:
-            if self.should_run_now(job):
-                logger.info(f"Cron job {job.name} is due, executing")
-                execution_id = await self.execute(job)
-                if execution_id:
-                    execution_ids.append(execution_id)
+        execution_ids = []
+        for job, result in zip(due, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error executing cron job {job.name}: {result}")
+            elif result:
+                execution_ids.append(result)
 
         return execution_ids
 
@@ -118,14 +210,25 @@ class CronManager:
 
         Returns the execution ID or None if failed to start.
         """
-        # Check if already running
+        # Check if already running, reserving the slot before any await so a
+        # concurrent trigger can't start the same job twice
         with self._lock:
             if job.id in self._running_jobs:
                 logger.warning(f"Cron job {job.name} is already running, skipping")
                 return None
+            self._running_jobs[job.id] = None
+
+        try:
+            return await self._execute(job)
+        finally:
+            with self._lock:
+                self._running_jobs.pop(job.id, None)
 
+    async def _execute(self, job: CronJob) -> int:
+        """Run a job whose running slot has already been reserved."""
         # Create execution record
-        execution = CronExecution.create(
+        execution = await run_db(
+            CronExecution.create,
             cron_job=job,
             started_at=datetime.now(),
         )
@@ -138,41 +241,44 @@ class CronManager:
                 cmd = job.command
             else:
                 shell = False
-                cmd = shlex.split(job.command)
-
-            # Build environment
-            env = os.environ.copy()
+                cmd = self._split_command(job.command)
 
             # Load .env file if specified
+            file_env = {}
             if job.env_file:
                 env_file_path = Path(job.env_file)
                 if not env_file_path.is_absolute() and working_dir:
                     env_file_path = Path(working_dir) / env_file_path
-                if env_file_path.exists():
-                    env.update(self._load_env_file(env_file_path))
-                else:
+                try:
+                    file_env = self._get_env_file(env_file_path)
+                except FileNotFoundError:
                     logger.warning(f"Env file not found for {job.name}: {env_file_path}")
 
-            # Add job-specific env vars (overrides env file)
-            env.update(job.get_env_vars())
+            # Build environment: job-specific vars override the env file,
+            # which overrides the supervisor's own environment
+            if self._base_env is None:
+                self._base_env = dict(os.environ)
+            env = self._base_env | file_env | job.get_env_vars()
 
             # Start process
-            process = subprocess.Popen(
-                cmd,
-                shell=shell,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+            spawn_kwargs = dict(
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
                 cwd=working_dir,
                 env=env,
                 start_new_session=True,
             )
+            if shell:
+                process = await asyncio.create_subprocess_shell(cmd, **spawn_kwargs)
+            else:
+                process = await asyncio.create_subprocess_exec(*cmd, **spawn_kwargs)
 
             with self._lock:
                 self._running_jobs[job.id] = process
 
             # Update job timestamps
             job.last_run = datetime.now()
-            self.update_next_run(job)
+            await run_db(self.update_next_run, job)
 
             # Monitor and wait for completion
             stdout, stderr, metrics = await self._monitor_process(
@@ -192,7 +298,7 @@ class CronManager:
             execution.duration_seconds = duration
             execution.cpu_percent = metrics.get("cpu_percent")
             execution.memory_mb = metrics.get("memory_mb")
-            execution.save()
+            await run_db(execution.save)
 
             # Log result
             if execution.success:
@@ -209,14 +315,14 @@ class CronManager:
 
             return execution.id
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.error(f"Cron job {job.name} timed out after {job.timeout}s")
             execution.finished_at = datetime.now()
             execution.exit_code = -1
             execution.stderr = f"Timeout after {job.timeout} seconds"
             execution.success = False
             execution.duration_seconds = job.timeout
-            execution.save()
+            await run_db(execution.save)
             return execution.id
 
         except Exception as e:
@@ -225,19 +331,18 @@ class CronManager:
             execution.exit_code = -1
             execution.stderr = str(e)
             execution.success = False
-            execution.save()
+            await run_db(execution.save)
             return execution.id
 
-        finally:
-            with self._lock:
-                self._running_jobs.pop(job.id, None)
-
     async def _monitor_process(
-        self, process: subprocess.Popen, timeout: int, job_name: str
+        self, process: asyncio.subprocess.Process, timeout: int, job_name: str
     ) -> tuple[str, str, dict]:
         """
         Monitor a process and capture output with resource metrics.
 
+        Output is drained from the pipes as it arrives. If the job exceeds its
+        timeout the process group is killed and asyncio.TimeoutError is raised.
+
         Returns (stdout, stderr, metrics_dict).
         """
         metrics = {"cpu_percent": 0.0, "memory_mb": 0.0}
@@ -247,41 +352,76 @@ class CronManager:
         except psutil.NoSuchProcess:
             proc = None
 
-        # Use asyncio to wait for process with timeout
-        loop = asyncio.get_event_loop()
-
-        async def read_output():
-            return await loop.run_in_executor(
-                None, lambda: process.communicate(timeout=timeout)
-            )
-
-        # Sample metrics periodically while waiting
-        output_task = asyncio.create_task(read_output())
-
-        while not output_task.done():
+        stdout_buf = bytearray()
+        stderr_buf = bytearray()
+        completion = asyncio.ensure_future(asyncio.gather(
+            _drain_stream(process.stdout, stdout_buf),
+            _drain_stream(process.stderr, stderr_buf),
+            process.wait(),
+        ))
+
+        # Sample metrics periodically while waiting. The interval grows for
+        # long-running jobs and the child list is only re-enumerated every few
+        # seconds, since child pids rarely churn.
+        start = time.monotonic()
+        deadline = start + timeout
+        children: list[psutil.Process] = []
+        children_refreshed = 0.0
+
+        while not completion.done():
             if proc:
                 try:
-                    cpu = proc.cpu_percent(interval=0)
-                    mem = proc.memory_info().rss / 1024 / 1024
-
-                    # Include children
-                    try:
-                        for child in proc.children(recursive=True):
-                            cpu += child.cpu_percent(interval=0)
-                            mem += child.memory_info().rss / 1024 / 1024
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
+                    with proc.oneshot():
+                        cpu = proc.cpu_percent(interval=0)
+                        mem = proc.memory_info().rss / 1024 / 1024
+
+                    now = time.monotonic()
+                    if now - children_refreshed >= CHILD_REFRESH_SECONDS:
+                        try:
+                            children = proc.children(recursive=True)
+                        except (psutil.NoSuchProcess, psutil.AccessDenied):
+                            children = []
+                        children_refreshed = now
+
+                    # Include children, dropping any that have exited
+                    alive = []
+                    for child in children:
+                        try:
+                            with child.oneshot():
+                                cpu += child.cpu_percent(interval=0)
+                                mem += child.memory_info().rss / 1024 / 1024
+                            alive.append(child)
+                        except (psutil.NoSuchProcess, psutil.AccessDenied):
+                            pass
+                    children = alive
 
                     metrics["cpu_percent"] = max(metrics["cpu_percent"], cpu)
                     metrics["memory_mb"] = max(metrics["memory_mb"], mem)
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
 
-            await asyncio.sleep(0.5)
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0:
+                logger.warning(f"Cron job {job_name} exceeded timeout, killing")
+                try:
+                    os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    pass
+                completion.cancel()
+                try:
+                    await completion
+                except asyncio.CancelledError:
+                    pass
+                raise asyncio.TimeoutError()
+
+            interval = min(MAX_SAMPLE_INTERVAL, 0.5 * (1 + (now - start) // 30))
+            # Wake early if the process finishes before the next sample
+            await asyncio.wait({completion}, timeout=min(interval, remaining))
 
-        stdout_bytes, stderr_bytes = await output_task
-        stdout = stdout_bytes.decode("utf-8", errors="replace") if stdout_bytes else ""
-        stderr = stderr_bytes.decode("utf-8", errors="replace") if stderr_bytes else ""
+        await completion
+        stdout = stdout_buf.decode("utf-8", errors="replace")
+        stderr = stderr_buf.decode("utf-8", errors="replace")
 
         return stdout, stderr, metrics
 
@@ -295,13 +435,24 @@ class CronManager:
         with self._lock:
             return list(self._running_jobs.keys())
 
+    def running_ids(self) -> set[int]:
+        """Get the set of running job IDs, for checking many jobs under one lock."""
+        with self._lock:
+            return set(self._running_jobs)
+
     async def run_now(self, job: CronJob) -> int | None:
         """Manually trigger a job to run immediately."""
         logger.info(f"Manually triggering cron job {job.name}")
         return await self.execute(job)
 
-    def kill_job(self, job_id: int) -> bool:
-        """Kill a running job."""
+    def kill_job(self, job_id: int, grace: float = KILL_GRACE_SECONDS) -> bool:
+        """
+        Stop a running job.
+
+        Sends SIGTERM to the job's process group so it can flush its output,
+        then SIGKILL if it is still running after `grace` seconds. Must be
+        called from the event loop.
+        """
         with self._lock:
             process = self._running_jobs.get(job_id)
 
@@ -309,51 +460,99 @@ class CronManager:
             return False
 
         try:
-            os.killpg(os.getpgid(process.pid), 9)
-            return True
+            pgid = os.getpgid(process.pid)
+            os.killpg(pgid, signal.SIGTERM)
         except (ProcessLookupError, PermissionError):
             return False
 
+        asyncio.get_running_loop().call_later(grace, self._escalate_kill, process, pgid)
+        return True
+
+    def _escalate_kill(self, process: asyncio.subprocess.Process, pgid: int):
+        """SIGKILL a job's process group if it ignored SIGTERM."""
+        if process.returncode is not None:
+            return
+        logger.warning(f"Cron process {process.pid} ignored SIGTERM, sending SIGKILL")
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
     def validate_schedule(self, schedule: str) -> tuple[bool, str]:
         """Validate a cron schedule expression."""
-        try:
-            croniter(schedule)
-            return True, "Valid schedule"
-        except (KeyError, ValueError) as e:
-            return False, str(e)
+        return _validate_schedule(schedule)
 
     def get_schedule_description(self, schedule: str) -> str:
         """Get a human-readable description of when a job will run."""
-        try:
-            now = datetime.now()
-            cron = croniter(schedule, now)
-
-            # Get next few run times
-            runs = []
-            for _ in range(3):
-                runs.append(cron.get_next(datetime))
-
-            parts = schedule.split()
-            if len(parts) != 5:
-                return f"Next: {runs[0].strftime('%Y-%m-%d %H:%M')}"
-
-            # Simple descriptions for common patterns
-            minute, hour, dom, month, dow = parts
-
-            if schedule == "* * * * *":
-                return "Every minute"
-            elif minute.startswith("*/"):
-                interval = minute[2:]
-                return f"Every {interval} minutes"
-            elif minute != "*" and hour == "*":
-                return f"Every hour at minute {minute}"
-            elif minute != "*" and hour != "*" and dom == "*" and dow == "*":
-                return f"Daily at {hour}:{minute.zfill(2)}"
-            else:
-                return f"Next: {runs[0].strftime('%Y-%m-%d %H:%M')}"
-
-        except Exception:
+        description = _describe_pattern(schedule)
+        if description is not None:
+            return description
+
+        # No simple description - show the next run time (fixed for the minute)
+        return _describe_next_run(schedule, _current_minute())
+
+
+def _current_minute() -> int:
+    """Unix time of the start of the current minute."""
+    now = int(time.time())
+    return now - now % 60
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_schedule(schedule: str) -> tuple[bool, str]:
+    """Validate a cron expression (pure, so cached by schedule string)."""
+    try:
+        croniter(schedule)
+        return True, "Valid schedule"
+    except (KeyError, ValueError) as e:
+        return False, str(e)
+
+
+@functools.lru_cache(maxsize=1024)
+def _describe_next_run(schedule: str, minute: int) -> str:
+    """Describe the next run after the given minute.
+
+    Cron resolution is one minute, so the answer is the same for any time
+    within that minute and can be cached on (schedule, minute).
+    """
+    try:
+        next_run = croniter(schedule, datetime.fromtimestamp(minute)).get_next(datetime)
+        return f"Next: {next_run.strftime('%Y-%m-%d %H:%M')}"
+    except Exception:
+        return "Invalid schedule"
+
+
+@functools.lru_cache(maxsize=1024)
+def _describe_pattern(schedule: str) -> str | None:
+    """
+    Describe common schedule patterns using string checks only.
+
+    Returns "Invalid schedule" for invalid expressions, or None if the
+    schedule has no simple description.
+    """
+    try:
+        if not croniter.is_valid(schedule):
             return "Invalid schedule"
+    except Exception:
+        return "Invalid schedule"
+
+    parts = schedule.split()
+    if len(parts) != 5:
+        return None
+
+    # Simple descriptions for common patterns
+    minute, hour, dom, month, dow = parts
+
+    if schedule == "* * * * *":
+        return "Every minute"
+    elif minute.startswith("*/"):
+        interval = minute[2:]
+        return f"Every {interval} minutes"
+    elif minute != "*" and hour == "*":
+        return f"Every hour at minute {minute}"
+    elif minute != "*" and hour != "*" and dom == "*" and dow == "*":
+        return f"Daily at {hour}:{minute.zfill(2)}"
+    return None
 
 
 # Global cron manager instance
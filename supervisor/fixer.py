@@ -8,17 +8,29 @@ failed cron jobs.
 """
 
 import asyncio
+import fnmatch
+import functools
+import hashlib
 import json
 import logging
 import os
 import re
+import shlex
 import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Callable
 
 from dotenv import load_dotenv
 
+try:
+    import re2 as _regex
+except ImportError:
+    import re as _regex
+
 from .config import config
 from .models import CronExecution, CronJob, FixAttempt, LogEntry, Service
 from .process import process_manager
@@ -28,32 +40,109 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 
 logger = logging.getLogger(__name__)
 
+# Parallel workers used when pruning old backups
+BACKUP_DELETE_WORKERS = 4
+
+# Files and directories left out of code backups
+BACKUP_IGNORE_PATTERNS = (
+    "__pycache__", "*.pyc", ".git", "node_modules",
+    ".venv", "venv", "*.egg-info", ".mypy_cache",
+)
+_BACKUP_IGNORE_RE = re.compile("|".join(fnmatch.translate(p) for p in BACKUP_IGNORE_PATTERNS))
+
+# Per-service file recording the newest backup and its tree fingerprint
+BACKUP_FINGERPRINT_FILE = ".latest"
+
+
+def _tree_fingerprint(root: str) -> str:
+    """Hash the path, size and mtime of every non-ignored entry under root."""
+    digest = hashlib.blake2b(digest_size=16)
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            if _BACKUP_IGNORE_RE.match(entry.name):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            st = entry.stat(follow_symlinks=False)
+            digest.update(f"{entry.path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode(errors="surrogateescape"))
+    return digest.hexdigest()
+
+
+def _fast_copytree(src: str, dst: Path, ignore: tuple[str, ...] = BACKUP_IGNORE_PATTERNS):
+    """Copy a directory tree, skipping ignored names.
+
+    Uses rsync when available (native copy, honours the ignore list), and
+    falls back to shutil.copytree if rsync is missing or fails.
+    """
+    rsync = shutil.which("rsync")
+    if rsync:
+        excludes = [f"--exclude={pattern}" for pattern in ignore]
+        result = subprocess.run(
+            [rsync, "-a", *excludes, f"{src}/", f"{dst}/"],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            return
+        logger.warning(f"rsync backup failed, falling back to copytree: {result.stderr.strip()}")
+        shutil.rmtree(dst, ignore_errors=True)
+
+    shutil.copytree(src, dst, ignore=shutil.ignore_patterns(*ignore))
+
 
 def create_backup(working_dir: str, service_name: str) -> str:
     """Create a backup of the working directory before fixing.
 
-    Returns the backup path.
+    Returns the backup path. If the working tree is unchanged since the
+    latest backup, that backup's path is returned instead of copying again.
     """
     backup_base = config.data_dir / "backups" / service_name
     backup_base.mkdir(parents=True, exist_ok=True)
 
+    fingerprint = _tree_fingerprint(working_dir)
+    fingerprint_file = backup_base / BACKUP_FINGERPRINT_FILE
+    try:
+        latest, latest_fingerprint = fingerprint_file.read_text().split()
+    except (OSError, ValueError):
+        latest = latest_fingerprint = None
+    if latest_fingerprint == fingerprint and (backup_base / latest).is_dir():
+        logger.info(f"Working tree unchanged, reusing backup at {backup_base / latest}")
+        return str(backup_base / latest)
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_path = backup_base / timestamp
 
     # Copy the working directory
-    shutil.copytree(
-        working_dir,
-        backup_path,
-        ignore=shutil.ignore_patterns(
-            "__pycache__", "*.pyc", ".git", "node_modules",
-            ".venv", "venv", "*.egg-info", ".mypy_cache"
-        ),
-    )
+    _fast_copytree(working_dir, backup_path)
+    fingerprint_file.write_text(f"{timestamp} {fingerprint}\n")
 
     logger.info(f"Created backup at {backup_path}")
     return str(backup_path)
 
 
+def _restore_backup_python(backup: Path, target: Path):
+    """Replace each top-level entry of target with its copy from backup."""
+    # Remove current files that exist in backup
+    for item in backup.iterdir():
+        target_item = target / item.name
+        if target_item.exists():
+            if target_item.is_dir():
+                shutil.rmtree(target_item)
+            else:
+                target_item.unlink()
+
+    # Copy backup files to target
+    for item in backup.iterdir():
+        target_item = target / item.name
+        if item.is_dir():
+            shutil.copytree(item, target_item)
+        else:
+            shutil.copy2(item, target_item)
+
+
 def restore_backup(backup_path: str, working_dir: str) -> bool:
     """Restore a backup to the working directory.
 
@@ -67,22 +156,19 @@ def restore_backup(backup_path: str, working_dir: str) -> bool:
             logger.error(f"Backup not found: {backup_path}")
             return False
 
-        # Remove current files that exist in backup
-        for item in backup.iterdir():
-            target_item = target / item.name
-            if target_item.exists():
-                if target_item.is_dir():
-                    shutil.rmtree(target_item)
-                else:
-                    target_item.unlink()
-
-        # Copy backup files to target
-        for item in backup.iterdir():
-            target_item = target / item.name
-            if item.is_dir():
-                shutil.copytree(item, target_item)
-            else:
-                shutil.copy2(item, target_item)
+        rsync = shutil.which("rsync")
+        if rsync:
+            # Mirror the backup in one pass. Top-level entries that aren't in
+            # the backup are protected (as before), and ignored names like
+            # .git or .venv are never deleted since they aren't backed up.
+            excludes = [f"--exclude={pattern}" for pattern in BACKUP_IGNORE_PATTERNS]
+            subprocess.run(
+                [rsync, "-a", "--delete", "--filter=P /*", *excludes, f"{backup}/", f"{target}/"],
+                check=True,
+                capture_output=True,
+            )
+        else:
+            _restore_backup_python(backup, target)
 
         logger.info(f"Restored backup from {backup_path} to {working_dir}")
         return True
@@ -98,13 +184,61 @@ def cleanup_old_backups(service_name: str, keep: int = 10):
     if not backup_base.exists():
         return
 
-    backups = sorted(backup_base.iterdir(), key=lambda p: p.name, reverse=True)
-    for old_backup in backups[keep:]:
+    with os.scandir(backup_base) as it:
+        backups = sorted(
+            (e for e in it if e.is_dir(follow_symlinks=False)), key=lambda e: e.name, reverse=True
+        )
+    old_backups = [Path(e.path) for e in backups[keep:]]
+    if not old_backups:
+        return
+
+    # Deletions are filesystem-bound: split the backups into one batch per
+    # worker, and let each worker remove its whole batch with a single rm
+    workers = min(BACKUP_DELETE_WORKERS, len(old_backups))
+    batches = [old_backups[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_remove_backups, batches))
+
+
+def _remove_backups(paths: list[Path]):
+    """Delete backup directories with one rm -rf, falling back to shutil.rmtree."""
+    rm = shutil.which("rm")
+    if rm:
+        result = subprocess.run(
+            [rm, "-rf", "--", *(str(p) for p in paths)],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode == 0:
+            for path in paths:
+                logger.debug(f"Removed old backup: {path}")
+            return
+        logger.warning(f"rm -rf failed for old backups, retrying individually: {result.stderr.strip()}")
+
+    for path in paths:
+        if not path.exists():
+            continue
         try:
-            shutil.rmtree(old_backup)
-            logger.debug(f"Removed old backup: {old_backup}")
+            shutil.rmtree(path)
+            logger.debug(f"Removed old backup: {path}")
         except Exception as e:
-            logger.warning(f"Failed to remove old backup {old_backup}: {e}")
+            logger.warning(f"Failed to remove old backup {path}: {e}")
+
+
+@functools.lru_cache(maxsize=256)
+def _split_command(command: str) -> tuple[str, ...]:
+    """shlex.split a service command, cached by command string."""
+    return tuple(shlex.split(command))
+
+
+@functools.lru_cache(maxsize=256)
+def _script_dir(command: str) -> str | None:
+    """Directory of the first .py path in a command, if any."""
+    for part in _split_command(command):
+        if part.endswith(".py") and "/" in part:
+            return str(Path(part).parent)
+    return None
+
 
 # Error patterns to detect
 ERROR_PATTERNS = [
@@ -124,7 +258,28 @@ ERROR_PATTERNS = [
     r"RuntimeError:",
 ]
 
-COMPILED_PATTERNS = [re.compile(p, re.IGNORECASE) for p in ERROR_PATTERNS]
+# All patterns as one case-insensitive alternation, so a line is scanned once.
+# Uses RE2 (linear time, no catastrophic backtracking) when google-re2 is
+# installed, otherwise the stdlib engine.
+ERROR_RE = _regex.compile("(?i)" + "|".join(f"(?:{p})" for p in ERROR_PATTERNS))
+
+# Lowercase substrings that every ERROR_RE match contains; checked against the
+# lowercased line before the regex so ordinary lines never reach the regex engine.
+# Every ERROR_PATTERNS entry must contain one of these (case-insensitively), or
+# the prefilter would silently drop lines the regex accepts.
+_FAST_MARKERS = ("error", "exception", "traceback")
+
+CHECK_INTERVAL_SECONDS = 60  # Upper bound between fix checks
+WAKE_SETTLE_SECONDS = 2.0  # Let the rest of a traceback arrive after a wake-up
+ROBOT_WORKERS = 2  # Concurrent Robot runs; kept off the default executor
+
+
+def is_error_line(message: str) -> bool:
+    """Check whether a log line looks like a real error."""
+    lower = message.lower()
+    if not any(m in lower for m in _FAST_MARKERS):
+        return False
+    return ERROR_RE.search(message) is not None
 
 
 class AutoFixer:
@@ -133,9 +288,14 @@ class AutoFixer:
     def __init__(self):
         self._running = False
         self._task = None
-        self._recent_errors: dict[str, list[str]] = {}  # service -> error lines
+        self._recent_errors: dict[str, deque[str]] = {}  # service -> last 50 error lines
+        self._has_error: set[str] = set()  # services with an ERROR_RE match in context
+        self._dirty: set[str] = set()  # services with new errors since last check
         self._fix_cooldown: dict[str, datetime] = {}  # service -> last fix time
         self._cooldown_minutes = 10  # Don't fix same service within 10 minutes
+        self._wake = asyncio.Event()  # Set when a service is newly flagged
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._robot_executor: ThreadPoolExecutor | None = None
 
     async def start(self):
         """Start the auto-fixer."""
@@ -147,6 +307,7 @@ class AutoFixer:
             return
 
         self._running = True
+        self._loop = asyncio.get_running_loop()
         self._task = asyncio.create_task(self._fixer_loop())
         logger.info("Auto-fixer started")
 
@@ -159,27 +320,47 @@ class AutoFixer:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._robot_executor:
+            self._robot_executor.shutdown(wait=False, cancel_futures=True)
+            self._robot_executor = None
         logger.info("Auto-fixer stopped")
 
+    async def _run_robot(self, prompt: str, config_obj):
+        """Run Robot on the dedicated executor so it can't starve the default pool."""
+        from robot import Robot
+
+        if self._robot_executor is None:
+            self._robot_executor = ThreadPoolExecutor(
+                max_workers=ROBOT_WORKERS, thread_name_prefix="robot"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._robot_executor,
+            functools.partial(Robot.run, prompt=prompt, agent="claude", config=config_obj),
+        )
+
     def on_log(self, service_name: str, level: str, message: str):
-        """Called when a log entry is received. Collects error context."""
+        """Called when a log entry is received. Collects error context.
+
+        Every error-level line is kept, whether or not it matches ERROR_RE,
+        so that traceback frames and other unmarked lines stay in context;
+        matching lines flag the service for fixing.
+        """
         if level != "error":
             return
 
-        # Check if this looks like an error
-        is_error = any(p.search(message) for p in COMPILED_PATTERNS)
-        if not is_error and level == "error":
-            # stderr but not a recognized error pattern - still collect
-            is_error = True
-
-        if is_error:
-            if service_name not in self._recent_errors:
-                self._recent_errors[service_name] = []
-            self._recent_errors[service_name].append(message)
+        # Bounded deque keeps only the last 50 lines of error context
+        errors = self._recent_errors.get(service_name)
+        if errors is None:
+            errors = self._recent_errors[service_name] = deque(maxlen=50)
+        errors.append(message)
+        self._dirty.add(service_name)
 
-            # Keep only last 50 lines of error context
-            if len(self._recent_errors[service_name]) > 50:
-                self._recent_errors[service_name] = self._recent_errors[service_name][-50:]
+        if service_name not in self._has_error and is_error_line(message):
+            self._has_error.add(service_name)
+            # Log callbacks run on reader threads, so hand the wake-up to the loop
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._wake.set)
 
     async def _fixer_loop(self):
         """Main fixer loop - checks for accumulated errors and attempts fixes."""
@@ -189,23 +370,32 @@ class AutoFixer:
             except Exception as e:
                 logger.error(f"Error in fixer loop: {e}")
 
-            await asyncio.sleep(60)  # Check every minute
+            # Sleep until a service is flagged, or at most a minute
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=CHECK_INTERVAL_SECONDS)
+                await asyncio.sleep(WAKE_SETTLE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._wake.clear()
 
     async def _check_and_fix(self):
         """Check for errors that need fixing."""
-        for service_name, errors in list(self._recent_errors.items()):
-            if not errors:
+        # Only services with new errors since the last check are considered
+        for service_name in list(self._dirty):
+            errors = self._recent_errors.get(service_name)
+            if not errors or service_name not in self._has_error:
+                # Nothing fixable yet; on_log re-marks it on the next error
+                self._dirty.discard(service_name)
                 continue
 
-            # Check cooldown
+            # Check cooldown (stays dirty so it is retried afterwards)
             last_fix = self._fix_cooldown.get(service_name)
             if last_fix and datetime.now() - last_fix < timedelta(minutes=self._cooldown_minutes):
                 continue
 
-            # Look for traceback patterns (indicates real error)
+            self._dirty.discard(service_name)
             error_text = "\n".join(errors)
-            if "Traceback" not in error_text and "Error" not in error_text:
-                continue
 
             # Get service
             service = Service.get_or_none(Service.name == service_name)
@@ -220,8 +410,9 @@ class AutoFixer:
                 if result.success:
                     logger.info(f"Auto-fix succeeded for {service_name}")
                     # Clear errors and restart service
-                    self._recent_errors[service_name] = []
-                    process_manager.restart(service)
+                    errors.clear()
+                    self._has_error.discard(service_name)
+                    await process_manager.restart_async(service)
                 else:
                     logger.warning(f"Auto-fix failed for {service_name}")
             except Exception as e:
@@ -233,20 +424,13 @@ class AutoFixer:
     async def attempt_fix(self, service: Service, error_text: str) -> FixAttempt:
         """Attempt to fix an error using Robot."""
         try:
-            from robot import Robot
             from robot.base import AgentConfig
 
             # Determine working directory
             working_dir = service.working_dir
             if not working_dir:
                 # Try to extract from command
-                import shlex
-
-                parts = shlex.split(service.command)
-                for part in parts:
-                    if part.endswith(".py") and "/" in part:
-                        working_dir = str(Path(part).parent)
-                        break
+                working_dir = _script_dir(service.command)
 
             if not working_dir:
                 logger.error(f"Cannot determine working directory for {service.name}")
@@ -257,11 +441,11 @@ class AutoFixer:
                     success=False,
                 )
 
-            # Create backup before modifying code
+            # Create backup before modifying code (copying runs off the event loop)
             backup_path = None
             try:
-                backup_path = create_backup(working_dir, service.name)
-                cleanup_old_backups(service.name)
+                backup_path = await asyncio.to_thread(create_backup, working_dir, service.name)
+                await asyncio.to_thread(cleanup_old_backups, service.name)
             except Exception as e:
                 logger.warning(f"Failed to create backup for {service.name}: {e}")
 
@@ -286,15 +470,7 @@ The service command is: {service.command}
             )
 
             # Run Robot
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: Robot.run(
-                    prompt=prompt,
-                    agent="claude",
-                    config=config_obj,
-                ),
-            )
+            response = await self._run_robot(prompt, config_obj)
 
             # Record attempt
             files_modified = json.dumps(response.files_modified) if response.files_modified else None
@@ -331,18 +507,19 @@ The service command is: {service.command}
         """Manually trigger a fix attempt. Returns dict for job serialization."""
         # Get recent errors if no description provided
         if not error_description:
-            errors = self._recent_errors.get(service.name, [])
+            errors = self._recent_errors.get(service.name)
             if errors:
-                error_description = "\n".join(errors[-20:])
+                error_description = "\n".join(list(errors)[-20:])
             else:
                 # Fetch from database
                 recent_logs = (
-                    LogEntry.select()
+                    LogEntry.select(LogEntry.message)
                     .where(LogEntry.service == service, LogEntry.level == "error")
                     .order_by(LogEntry.timestamp.desc())
                     .limit(20)
+                    .tuples()
                 )
-                error_description = "\n".join([log.message for log in recent_logs])
+                error_description = "\n".join(row[0] for row in recent_logs)
 
         if not error_description:
             fix = FixAttempt.create(
@@ -380,7 +557,6 @@ The service command is: {service.command}
         logger.info(f"Attempting auto-fix for cron job {cron_job.name}")
 
         try:
-            from robot import Robot
             from robot.base import AgentConfig
 
             # Build error context from execution
@@ -394,11 +570,12 @@ The service command is: {service.command}
                 logger.info(f"No error output for cron job {cron_job.name}, skipping fix")
                 return False
 
-            # Create backup
+            # Create backup (off the event loop)
+            backup_name = f"cron_{cron_job.name}"
             backup_path = None
             try:
-                backup_path = create_backup(working_dir, f"cron_{cron_job.name}")
-                cleanup_old_backups(f"cron_{cron_job.name}")
+                backup_path = await asyncio.to_thread(create_backup, working_dir, backup_name)
+                await asyncio.to_thread(cleanup_old_backups, backup_name)
             except Exception as e:
                 logger.warning(f"Failed to create backup for cron job {cron_job.name}: {e}")
 
@@ -427,15 +604,7 @@ Duration: {execution.duration_seconds:.1f}s
             )
 
             # Run Robot
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: Robot.run(
-                    prompt=prompt,
-                    agent="claude",
-                    config=config_obj,
-                ),
-            )
+            response = await self._run_robot(prompt, config_obj)
 
             # Update execution record
             execution.fix_attempted = True
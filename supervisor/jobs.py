@@ -7,15 +7,23 @@ status tracking so the API remains responsive.
 
 import asyncio
 import logging
+import secrets
 import threading
-import uuid
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Callable, Optional
 
+from .config import config
+
 logger = logging.getLogger(__name__)
 
+# Caps concurrent AI runs (robot CLI subprocesses), so a burst of
+# onboard/scan jobs queues instead of launching them all at once
+ai_slots = asyncio.Semaphore(config.ai_max_concurrency)
+
 
 class JobStatus(Enum):
     PENDING = "pending"
@@ -37,23 +45,71 @@ class Job:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     progress: Optional[str] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    # ISO strings, formatted once when the times are set
+    _created_iso: str = field(default="", init=False, repr=False, compare=False)
+    _started_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _completed_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # Monotonic clock readings; wallclock is only read once, at creation
+    _created_ns: int = field(default=0, init=False, repr=False, compare=False)
+    _start_ns: int = field(default=0, init=False, repr=False, compare=False)
+    _end_ns: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._created_ns = time.perf_counter_ns()
+        self._created_iso = self.created_at.isoformat()
+
+    def update(self, **changes):
+        """Apply field changes together, so to_dict never sees half a transition."""
+        with self._lock:
+            for name, value in changes.items():
+                setattr(self, name, value)
+
+    def mark_running(self):
+        """Transition to RUNNING."""
+        now_ns = time.perf_counter_ns()
+        with self._lock:
+            self.status = JobStatus.RUNNING
+            self._start_ns = now_ns
+            self.started_at = self._wallclock(now_ns)
+            self._started_iso = self.started_at.isoformat()
+
+    def mark_finished(self, status: JobStatus, result: Any = None, error: Optional[str] = None):
+        """Transition to COMPLETED or FAILED."""
+        now_ns = time.perf_counter_ns()
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            self._end_ns = now_ns
+            self.completed_at = self._wallclock(now_ns)
+            self._completed_iso = self.completed_at.isoformat()
+
+    def _wallclock(self, ns: int) -> datetime:
+        """Wallclock time for a perf_counter_ns reading, relative to creation."""
+        return self.created_at + timedelta(microseconds=(ns - self._created_ns) // 1000)
 
     def to_dict(self) -> dict:
+        with self._lock:
+            return self._to_dict()
+
+    def _to_dict(self) -> dict:
+        duration = None
+        if self._start_ns:
+            # Monotonic; a job that is still running measures against now
+            end_ns = self._end_ns or time.perf_counter_ns()
+            duration = (end_ns - self._start_ns) / 1e9
         return {
             "id": self.id,
             "name": self.name,
             "status": self.status.value,
             "result": self.result,
             "error": self.error,
-            "created_at": self.created_at.isoformat(),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "created_at": self._created_iso,
+            "started_at": self._started_iso,
+            "completed_at": self._completed_iso,
             "progress": self.progress,
-            "duration_seconds": (
-                (self.completed_at or datetime.now()) - self.started_at
-            ).total_seconds()
-            if self.started_at
-            else None,
+            "duration_seconds": duration,
         }
 
 
@@ -61,18 +117,18 @@ class JobManager:
     """Manages background jobs."""
 
     def __init__(self, max_completed: int = 100):
-        self._jobs: dict[str, Job] = {}
+        self._jobs: dict[str, Job] = {}  # all jobs, in creation order
+        self._completed: OrderedDict[str, None] = OrderedDict()  # finished job ids, oldest first
         self._lock = threading.Lock()
         self._max_completed = max_completed
 
     def create_job(self, name: str) -> Job:
         """Create a new job."""
-        job_id = str(uuid.uuid4())[:8]
+        job_id = secrets.token_hex(4)
         job = Job(id=job_id, name=name)
 
         with self._lock:
             self._jobs[job_id] = job
-            self._cleanup_old_jobs()
 
         logger.info(f"Created job {job_id}: {name}")
         return job
@@ -83,14 +139,14 @@ class JobManager:
             return self._jobs.get(job_id)
 
     def list_jobs(self, status: Optional[JobStatus] = None) -> list[Job]:
-        """List all jobs, optionally filtered by status."""
+        """List all jobs, newest first, optionally filtered by status."""
         with self._lock:
             jobs = list(self._jobs.values())
 
+        # _jobs is in creation order, so reversing it gives newest first
         if status:
-            jobs = [j for j in jobs if j.status == status]
-
-        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+            return [j for j in reversed(jobs) if j.status == status]
+        return jobs[::-1]
 
     def run_in_background(
         self, name: str, func: Callable, *args, **kwargs
@@ -100,21 +156,18 @@ class JobManager:
 
         def wrapper():
             try:
-                job.status = JobStatus.RUNNING
-                job.started_at = datetime.now()
+                job.mark_running()
                 logger.info(f"Job {job.id} started: {name}")
 
                 result = func(*args, **kwargs)
 
-                job.result = result
-                job.status = JobStatus.COMPLETED
-                job.completed_at = datetime.now()
+                job.mark_finished(JobStatus.COMPLETED, result=result)
+                self._finish(job)
                 logger.info(f"Job {job.id} completed: {name}")
 
             except Exception as e:
-                job.error = str(e)
-                job.status = JobStatus.FAILED
-                job.completed_at = datetime.now()
+                job.mark_finished(JobStatus.FAILED, error=str(e))
+                self._finish(job)
                 logger.error(f"Job {job.id} failed: {name} - {e}")
 
         thread = threading.Thread(target=wrapper, daemon=True)
@@ -130,21 +183,18 @@ class JobManager:
 
         async def wrapper():
             try:
-                job.status = JobStatus.RUNNING
-                job.started_at = datetime.now()
+                job.mark_running()
                 logger.info(f"Job {job.id} started: {name}")
 
                 result = await coro_func(*args, **kwargs)
 
-                job.result = result
-                job.status = JobStatus.COMPLETED
-                job.completed_at = datetime.now()
+                job.mark_finished(JobStatus.COMPLETED, result=result)
+                self._finish(job)
                 logger.info(f"Job {job.id} completed: {name}")
 
             except Exception as e:
-                job.error = str(e)
-                job.status = JobStatus.FAILED
-                job.completed_at = datetime.now()
+                job.mark_finished(JobStatus.FAILED, error=str(e))
+                self._finish(job)
                 logger.error(f"Job {job.id} failed: {name} - {e}")
 
         asyncio.create_task(wrapper())
@@ -154,22 +204,20 @@ class JobManager:
         """Update job progress message."""
         with self._lock:
             job = self._jobs.get(job_id)
-            if job:
-                job.progress = progress
-
-    def _cleanup_old_jobs(self):
-        """Remove old completed/failed jobs to prevent memory growth."""
-        completed = [
-            j
-            for j in self._jobs.values()
-            if j.status in (JobStatus.COMPLETED, JobStatus.FAILED)
-        ]
-
-        if len(completed) > self._max_completed:
-            # Sort by completion time, remove oldest
-            completed.sort(key=lambda j: j.completed_at or datetime.min)
-            for job in completed[: len(completed) - self._max_completed]:
-                del self._jobs[job.id]
+        if job:
+            job.update(progress=progress)
+
+    def _finish(self, job: Job):
+        """Record a completed/failed job, evicting the oldest finished ones.
+
+        Finished jobs are tracked in completion order, so eviction is O(1)
+        and prevents memory growth.
+        """
+        with self._lock:
+            self._completed[job.id] = None
+            while len(self._completed) > self._max_completed:
+                old_id, _ = self._completed.popitem(last=False)
+                self._jobs.pop(old_id, None)
 
 
 # Global job manager instance
@@ -7,27 +7,49 @@ via a /api/cron/tick endpoint called by system cron every minute.
 """
 
 import asyncio
+import hashlib
 import logging
+import os
+import threading
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
+import orjson
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from peewee import Case, chunked, fn
 from pydantic import BaseModel, Field
 
-from .caddy import generate_caddyfile, get_caddy_config, reload_caddy
+from .caddy import close_client as close_caddy_client, generate_caddyfile, get_caddy_config, reload_caddy_debounced
 from .config import config
 from .cron import cron_manager
 from .fixer import auto_fixer
-from .robot_integration import run_robot_onboard, run_security_scan, stream_robot_chat, resolve_project_path
+from .robot_integration import (
+    invalidate_services_context,
+    resolve_project_path,
+    run_robot_onboard,
+    run_security_scan,
+    stream_robot_chat,
+)
 from .jobs import JobStatus, job_manager
-from .models import CronExecution, CronJob, FixAttempt, LogEntry, Metric, Service, initialize_db
+from .models import (
+    CronExecution,
+    CronJob,
+    FixAttempt,
+    LogEntry,
+    Metric,
+    Service,
+    initialize_db,
+    run_db,
+    write_transaction,
+)
 from .monitor import resource_monitor
 from .process import process_manager
 
@@ -63,36 +85,61 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting supervisor...")
 
-    # Wire up log callback to auto-fixer
-    def log_callback(service_name: str, level: str, message: str):
-        # Save to database
-        service = Service.get_or_none(Service.name == service_name)
-        if service:
-            LogEntry.create(service=service, level=level, message=message[:2000])
-        # Notify auto-fixer
-        auto_fixer.on_log(service_name, level, message)
+    loop = asyncio.get_running_loop()
+    log_flush_event = asyncio.Event()
 
-    process_manager.set_log_callback(log_callback)
+    # Wire up log callback to auto-fixer; lines arrive in batches, one per pipe read
+    def log_batch_callback(records: list[tuple[str, str, str]]):
+        # Buffer for the log writer; wake it early if the buffer is full
+        timestamp = datetime.now()
+        with _log_buffer_lock:
+            _log_buffer.extend(
+                (service_name, level, message[:2000], timestamp) for service_name, level, message in records
+            )
+            full = len(_log_buffer) >= LOG_FLUSH_ROWS
+        if full:
+            loop.call_soon_threadsafe(log_flush_event.set)
+        # Notify auto-fixer - it only collects error lines, and a line repeated
+        # within FIX_DEDUP_SECONDS adds nothing to its context
+        now = time.monotonic()
+        for service_name, level, message in records:
+            if level != "error":
+                continue
+            last = _last_fix_line.get(service_name)
+            if last and last[0] == message and now - last[1] < FIX_DEDUP_SECONDS:
+                continue
+            _last_fix_line[service_name] = (message, now)
+            auto_fixer.on_log(service_name, level, message)
+
+    process_manager.set_log_batch_callback(log_batch_callback)
+    process_manager.set_event_loop(asyncio.get_running_loop())
 
     # Wire up cron fix callback
     cron_manager.set_fix_callback(auto_fixer.fix_cron_job)
 
-    # Start enabled services
-    for service in Service.select().where(Service.enabled == True):
-        if not process_manager.is_running(service.name):
-            logger.info(f"Starting service: {service.name}")
-            process_manager.start(service)
-
-    # Update next run times for all cron jobs
-    for cron_job in CronJob.select().where(CronJob.enabled == True):
-        cron_manager.update_next_run(cron_job)
+    # Cache service rows, then start enabled services
+    _service_cache.update((service.name, service) for service in Service.select())
+    to_start = [
+        service for service in _service_cache.values()
+        if service.enabled and not process_manager.is_running(service.name)
+    ]
+    for service in to_start:
+        logger.info(f"Starting service: {service.name}")
+    # Spawn in parallel so startup takes the slowest start, not the sum
+    await asyncio.gather(*(asyncio.to_thread(process_manager.start, service) for service in to_start))
+
+    # Update next run times for all cron jobs in a single transaction
+    with write_transaction():
+        for cron_job in CronJob.select().where(CronJob.enabled == True):
+            cron_manager.update_next_run(cron_job)
 
     # Start background tasks
     await resource_monitor.start()
     await auto_fixer.start()
 
-    # Start crash monitor
+    # Start crash monitor and log writer
     crash_monitor_task = asyncio.create_task(crash_monitor_loop())
+    log_writer_task = asyncio.create_task(log_writer_loop(log_flush_event))
 
     yield
 
@@ -101,17 +148,92 @@ async def lifespan(app: FastAPI):
     crash_monitor_task.cancel()
     await resource_monitor.stop()
     await auto_fixer.stop()
+    await close_caddy_client()
     process_manager.shutdown_all()
+    log_writer_task.cancel()
+    _flush_log_buffer()
+
+
+LOG_FLUSH_INTERVAL = 1.0  # Seconds between batched log writes
+LOG_FLUSH_ROWS = 500  # Flush early once this many lines are buffered
+
+FIX_DEDUP_SECONDS = 1.0  # Drop identical consecutive error lines within this window
+
+# Last error line passed to the auto-fixer per service: (message, monotonic time)
+_last_fix_line: dict[str, tuple[str, float]] = {}
+
+# (service_name, level, message, timestamp) rows waiting to be written
+_log_buffer: list[tuple[str, str, str, datetime]] = []
+_log_buffer_lock = threading.Lock()
+
+
+def _flush_log_buffer():
+    """Write buffered log lines in one transaction."""
+    global _log_buffer
+    with _log_buffer_lock:
+        rows, _log_buffer = _log_buffer, []
+    if not rows:
+        return
+
+    # Resolve service ids once per flush; lines from deleted services are dropped
+    names = {row[0] for row in rows}
+    ids = dict(Service.select(Service.name, Service.id).where(Service.name.in_(names)).tuples())
+    data = [(ids[name], level, message, ts) for name, level, message, ts in rows if name in ids]
+    if not data:
+        return
+
+    fields = [LogEntry.service, LogEntry.level, LogEntry.message, LogEntry.timestamp]
+    with write_transaction():
+        for batch in chunked(data, 200):
+            LogEntry.insert_many(batch, fields=fields).execute()
+
+
+async def log_writer_loop(flush_event: asyncio.Event):
+    """Background task that writes buffered log lines in batches."""
+    while True:
+        try:
+            await asyncio.wait_for(flush_event.wait(), timeout=LOG_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        flush_event.clear()
+        try:
+            await run_db(_flush_log_buffer)
+        except Exception as e:
+            logger.error(f"Error writing logs: {e}")
+
+
+CRASH_CHECK_INTERVAL = 30  # Backstop between crash checks; exits normally wake it
 
 
 async def crash_monitor_loop():
-    """Background task to check for crashed processes."""
+    """Background task to restart crashed processes as soon as they exit."""
     while True:
         try:
             await process_manager.check_and_restart_crashed()
         except Exception as e:
             logger.error(f"Error in crash monitor: {e}")
-        await asyncio.sleep(10)
+        try:
+            await asyncio.wait_for(process_manager.crash_event.wait(), timeout=CRASH_CHECK_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        process_manager.crash_event.clear()
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (faster, and encodes datetimes natively)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _etag_response(request: Request, content: Any) -> Response:
+    """Render content with an ETag, or an empty 304 if the client already has it."""
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 
 app = FastAPI(
@@ -119,6 +241,7 @@ app = FastAPI(
     description="Service manager for Python/FastAPI projects",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
@@ -164,6 +287,8 @@ class ServiceUpdate(BaseModel):
     watch_dirs: Optional[list[str]] = None
 
 
+# Documents the _service_response() shape in OpenAPI; endpoints return that
+# dict directly rather than revalidating it through response_model
 class ServiceResponse(BaseModel):
     id: int
     name: str
@@ -205,6 +330,7 @@ class CronJobUpdate(BaseModel):
     env_file: Optional[str] = None
 
 
+# Documents the _cron_job_response() shape in OpenAPI (see ServiceResponse)
 class CronJobResponse(BaseModel):
     id: int
     name: str
@@ -231,16 +357,21 @@ async def dashboard(request: Request):
     if not templates_dir.exists():
         return HTMLResponse("<h1>Supervisor</h1><p>Dashboard templates not installed.</p>")
 
+    procs = process_manager.snapshot()
+    # Latest sampled metrics for all services (includes disk usage even when stopped)
+    all_metrics = resource_monitor.snapshot(procs)
+
     services = []
     for service in Service.select():
-        running = process_manager.is_running(service.name)
-        # Get metrics for all services (includes disk usage even when stopped)
-        metrics = resource_monitor.get_current_metrics(service.name)
+        info = procs.get(service.name)
+        metrics = all_metrics.get(service.name)
+        if metrics is None and info:
+            metrics = await asyncio.to_thread(resource_monitor.get_current_metrics, service.name)
         services.append(
             {
                 "service": service,
-                "running": running,
-                "pid": process_manager.get_pid(service.name),
+                "running": info is not None,
+                "pid": info.process.pid if info else None,
                 "metrics": metrics,
             }
         )
@@ -256,14 +387,13 @@ async def dashboard(request: Request):
 
 
 # Service CRUD
-@app.post("/api/services", response_model=ServiceResponse)
+@app.post("/api/services", responses={200: {"model": ServiceResponse}})
 async def create_service(data: ServiceCreate):
     """Register a new service."""
-    if Service.get_or_none(Service.name == data.name):
+    if get_service_cached(data.name):
         raise HTTPException(status_code=409, detail=f"Service '{data.name}' already exists")
 
-    import json
-    watch_dirs_json = json.dumps(data.watch_dirs) if data.watch_dirs else None
+    watch_dirs_json = orjson.dumps(data.watch_dirs).decode() if data.watch_dirs else None
 
     service = Service.create(
         name=data.name,
@@ -276,6 +406,8 @@ async def create_service(data: ServiceCreate):
         caddy_path=data.caddy_path,
         watch_dirs=watch_dirs_json,
     )
+    _service_cache[service.name] = service
+    invalidate_services_context()
 
     # Start if enabled
     if service.enabled:
@@ -287,27 +419,27 @@ async def create_service(data: ServiceCreate):
 @app.get("/api/services")
 async def list_services():
     """List all registered services."""
-    services = []
-    for service in Service.select():
-        services.append(_service_response(service))
-    return services
+    procs = process_manager.snapshot()
+    return [_service_response(service, procs) for service in Service.select()]
 
 
-@app.get("/api/services/{name}", response_model=ServiceResponse)
+@app.get("/api/services/{name}", responses={200: {"model": ServiceResponse}})
 async def get_service(name: str):
     """Get a specific service."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
     return _service_response(service)
 
 
-@app.put("/api/services/{name}", response_model=ServiceResponse)
+@app.put("/api/services/{name}", responses={200: {"model": ServiceResponse}})
 async def update_service(name: str, data: ServiceUpdate):
     """Update a service configuration."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
+    # Drop the cached row while it is being modified; re-added after saving
+    invalidate_service(name)
 
     if data.command is not None:
         service.command = data.command
@@ -317,6 +449,8 @@ async def update_service(name: str, data: ServiceUpdate):
         service.port = data.port
     if data.enabled is not None:
         service.enabled = data.enabled
+        if not data.enabled:
+            process_manager.cancel_restart(name)
     if data.expose_caddy is not None:
         service.expose_caddy = data.expose_caddy
     if data.caddy_subdomain is not None:
@@ -324,25 +458,29 @@ async def update_service(name: str, data: ServiceUpdate):
     if data.caddy_path is not None:
         service.caddy_path = data.caddy_path
     if data.watch_dirs is not None:
-        import json
-        service.watch_dirs = json.dumps(data.watch_dirs)
+        service.watch_dirs = orjson.dumps(data.watch_dirs).decode()
 
     service.save()
+    _service_cache[service.name] = service
+    invalidate_services_context()
     return _service_response(service)
 
 
 @app.delete("/api/services/{name}")
 async def delete_service(name: str):
     """Unregister a service (stops it first)."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
-    # Stop if running
+    # Stop if running, and drop any pending crash restart
+    process_manager.cancel_restart(name)
     if process_manager.is_running(name):
         process_manager.stop(name)
 
     service.delete_instance()
+    invalidate_service(name)
+    invalidate_services_context()
     return {"status": "deleted", "name": name}
 
 
@@ -350,7 +488,7 @@ async def delete_service(name: str):
 @app.post("/api/services/{name}/start")
 async def start_service(name: str):
     """Start a service."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
@@ -367,10 +505,12 @@ async def start_service(name: str):
 @app.post("/api/services/{name}/stop")
 async def stop_service(name: str):
     """Stop a service."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
+    # A crashed service waiting out its backoff is not running but must stay down
+    process_manager.cancel_restart(name)
     if not process_manager.is_running(name):
         return {"status": "not_running", "name": name}
 
@@ -384,11 +524,11 @@ async def stop_service(name: str):
 @app.post("/api/services/{name}/restart")
 async def restart_service(name: str):
     """Restart a service."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
-    success = process_manager.restart(service)
+    success = await process_manager.restart_async(service)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to restart service")
 
@@ -404,16 +544,29 @@ async def get_service_logs(
     offset: int = Query(0, ge=0),
 ):
     """Get recent logs for a service."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
-    query = LogEntry.select().where(LogEntry.service == service)
+    query = LogEntry.select(LogEntry.id, LogEntry.level, LogEntry.message, LogEntry.timestamp).where(
+        LogEntry.service == service
+    )
     if level:
         query = query.where(LogEntry.level == level)
 
-    logs = query.order_by(LogEntry.timestamp.desc()).offset(offset).limit(limit)
-    return [log.to_dict() for log in logs]
+    # Plain row dicts (same shape as LogEntry.to_dict) - up to 1000 rows, so
+    # skip building a model instance per row; service_id is already known
+    logs = query.order_by(LogEntry.timestamp.desc()).offset(offset).limit(limit).dicts()
+    return [
+        {
+            "id": log["id"],
+            "service_id": service.id,
+            "level": log["level"],
+            "message": log["message"],
+            "timestamp": log["timestamp"],
+        }
+        for log in logs
+    ]
 
 
 # Metrics
@@ -423,7 +576,7 @@ async def get_service_metrics(
     hours: int = Query(24, ge=1, le=168),
 ):
     """Get resource metrics history for a service."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
@@ -439,11 +592,11 @@ async def get_service_metrics(
 @app.get("/api/services/{name}/metrics/current")
 async def get_service_current_metrics(name: str):
     """Get current resource usage for a service."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
-    metrics = resource_monitor.get_current_metrics(name)
+    metrics = await asyncio.to_thread(resource_monitor.get_current_metrics, name)
     if not metrics:
         raise HTTPException(status_code=404, detail="Service not running")
     return metrics
@@ -451,36 +604,45 @@ async def get_service_current_metrics(name: str):
 
 # Status overview
 @app.get("/api/status")
-async def get_status():
-    """Get overview of all services."""
+async def get_status(request: Request):
+    """Get overview of all services. Supports If-None-Match for polling clients."""
+    procs = process_manager.snapshot()
+    all_metrics = resource_monitor.snapshot(procs)
+
     services = []
-    for service in Service.select():
-        running = process_manager.is_running(service.name)
-        metrics = resource_monitor.get_current_metrics(service.name) if running else None
+    for row in Service.select(Service.name, Service.enabled, Service.port).dicts():
+        name = row["name"]
+        info = procs.get(name)
+        metrics = None
+        if info:
+            # Sample live only for services the monitor loop hasn't covered
+            metrics = all_metrics.get(name) or await asyncio.to_thread(
+                resource_monitor.get_current_metrics, name
+            )
         services.append(
             {
-                "name": service.name,
-                "enabled": service.enabled,
-                "running": running,
-                "pid": process_manager.get_pid(service.name),
-                "port": service.port,
+                "name": name,
+                "enabled": row["enabled"],
+                "running": info is not None,
+                "pid": info.process.pid if info else None,
+                "port": row["port"],
                 "metrics": metrics,
             }
         )
-    return {
+    return _etag_response(request, {
         "services": services,
         "total": len(services),
         "running": sum(1 for s in services if s["running"]),
         "enabled": sum(1 for s in services if s["enabled"]),
         "service_host": config.get_service_host(),
-    }
+    })
 
 
 # Auto-fix
 @app.post("/api/services/{name}/fix")
 async def trigger_fix(name: str, error_description: Optional[str] = None):
     """Manually trigger an auto-fix attempt. Runs in background, returns job ID."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
@@ -498,7 +660,7 @@ async def trigger_fix(name: str, error_description: Optional[str] = None):
 @app.get("/api/services/{name}/fixes")
 async def get_fix_history(name: str, limit: int = Query(20, ge=1, le=100)):
     """Get fix attempt history for a service."""
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
@@ -514,9 +676,10 @@ async def get_fix_history(name: str, limit: int = Query(20, ge=1, le=100)):
 @app.post("/api/fixes/{fix_id}/restore")
 async def restore_fix_backup(fix_id: int):
     """Restore code from a fix attempt's backup."""
-    from .fixer import restore_backup
+    from .fixer import _script_dir, restore_backup
 
-    fix = FixAttempt.get_or_none(FixAttempt.id == fix_id)
+    # Fetch the fix and its service in one query
+    fix = FixAttempt.select(FixAttempt, Service).join(Service).where(FixAttempt.id == fix_id).first()
     if not fix:
         raise HTTPException(status_code=404, detail=f"Fix attempt {fix_id} not found")
 
@@ -528,14 +691,7 @@ async def restore_fix_backup(fix_id: int):
 
     # Get working directory
     service = fix.service
-    working_dir = service.working_dir
-    if not working_dir:
-        import shlex
-        parts = shlex.split(service.command)
-        for part in parts:
-            if part.endswith(".py") and "/" in part:
-                working_dir = str(Path(part).parent)
-                break
+    working_dir = service.working_dir or _script_dir(service.command)
 
     if not working_dir:
         raise HTTPException(status_code=400, detail="Cannot determine working directory")
@@ -550,7 +706,7 @@ async def restore_fix_backup(fix_id: int):
     fix.save()
 
     # Restart service
-    process_manager.restart(service)
+    await process_manager.restart_async(service)
 
     return {
         "status": "restored",
@@ -564,11 +720,12 @@ async def restore_fix_backup(fix_id: int):
 @app.get("/api/caddy/config")
 async def get_caddy_generated_config():
     """Get the generated Caddy configuration."""
+    services = await run_db(lambda: list(Service.select().where(Service.expose_caddy == True)))
     return {
-        "caddyfile": generate_caddyfile(),
+        "caddyfile": generate_caddyfile(services),
         "services": [
             {"name": s.name, "port": s.port, "path": s.caddy_path}
-            for s in Service.select().where(Service.expose_caddy == True)
+            for s in services
         ],
     }
 
@@ -585,7 +742,8 @@ async def get_caddy_current_config():
 @app.post("/api/caddy/reload")
 async def reload_caddy_config():
     """Regenerate and reload Caddy configuration."""
-    success, message = await reload_caddy()
+    # Explicit reloads always go through, even if the content looks current
+    success, message = await reload_caddy_debounced(force=True)
     if not success:
         raise HTTPException(status_code=500, detail=message)
     return {"status": "reloaded", "message": message}
@@ -620,19 +778,119 @@ async def get_job(job_id: str):
 async def get_supervisor_logs(lines: int = Query(100, ge=1, le=1000)):
     """Get recent supervisor log entries."""
     try:
-        with open(config.supervisor_log, "r") as f:
-            all_lines = f.readlines()
-            return {"lines": all_lines[-lines:], "total": len(all_lines)}
+        return await asyncio.to_thread(_read_log_tail, config.supervisor_log, lines)
     except FileNotFoundError:
-        return {"lines": [], "total": 0}
+        return {"lines": [], "size": 0}
 
 
 # Helper functions
-def _service_response(service: Service) -> dict:
-    """Convert service to response dict with runtime info."""
+# Service rows by name, so handlers don't query the DB for every request.
+# Kept in step with create/update/delete below.
+_service_cache: dict[str, Service] = {}
+
+
+def get_service_cached(name: str) -> Service | None:
+    """Get a service by name, from the cache or the database."""
+    service = _service_cache.get(name)
+    if service is None:
+        service = Service.get_or_none(Service.name == name)
+        if service is not None:
+            _service_cache[name] = service
+    return service
+
+
+def invalidate_service(name: str):
+    """Drop a service from the cache."""
+    _service_cache.pop(name, None)
+
+
+CRON_JOB_CACHE_TTL = 2.0  # Seconds a loaded cron job row is reused across requests
+
+# name -> (expires, job). Short-lived, since the cron manager updates
+# last_run/next_run on its own instances
+_cron_job_cache: dict[str, tuple[float, CronJob]] = {}
+
+
+def get_cron_job_cached(name: str) -> CronJob | None:
+    """Get a cron job by name, reusing a row loaded in the last few seconds."""
+    now = time.monotonic()
+    entry = _cron_job_cache.get(name)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    job = CronJob.get_or_none(CronJob.name == name)
+    if job is None:
+        _cron_job_cache.pop(name, None)
+    else:
+        _cron_job_cache[name] = (now + CRON_JOB_CACHE_TTL, job)
+    return job
+
+
+def invalidate_cron_job(name: str):
+    """Drop a cron job from the cache."""
+    _cron_job_cache.pop(name, None)
+
+
+LOG_TAIL_BLOCK = 64 * 1024  # Bytes read per step when tailing a log
+LOG_TAIL_MAX_BYTES = 4 * 1024 * 1024  # Never read more than this from the end
+
+
+def _read_log_tail(path: Path, lines: int) -> dict:
+    """Read the last lines of a log by seeking backwards from the end.
+
+    Memory and time depend on the requested lines, not the file size.
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        pos = size
+        blocks = []
+        newlines = 0
+        # Read blocks backwards until we have enough newlines (or hit a limit);
+        # blocks are joined once at the end rather than prepended each time
+        while pos > 0 and newlines <= lines and size - pos < LOG_TAIL_MAX_BYTES:
+            step = min(LOG_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+        data = b"".join(reversed(blocks))
+
+    tail = data.decode("utf-8", "replace").splitlines(keepends=True)
+    if pos > 0 and tail:
+        tail = tail[1:]  # First line is probably partial
+    return {"lines": tail[-lines:], "size": size}
+
+
+PROJECTS_CACHE_TTL = 5.0  # Seconds to reuse a ~/Code scan
+_projects_cache: tuple[float, Path, list[dict]] | None = None  # (expires, dir, projects)
+
+
+def _scan_projects(code_dir: Path) -> list[dict]:
+    """List project directories, using dirent types to skip most stat calls."""
+    with os.scandir(code_dir) as it:
+        projects = [
+            {"name": entry.name, "path": entry.path}
+            for entry in it
+            if not entry.name.startswith(".") and entry.is_dir()
+        ]
+    projects.sort(key=lambda p: p["name"])
+    return projects
+
+
+def _service_response(service: Service, procs: dict | None = None) -> dict:
+    """Convert service to response dict with runtime info.
+
+    procs is an optional process_manager.snapshot() to avoid per-service lookups.
+    """
     data = service.to_dict()
-    data["running"] = process_manager.is_running(service.name)
-    data["pid"] = process_manager.get_pid(service.name)
+    if procs is None:
+        data["running"] = process_manager.is_running(service.name)
+        data["pid"] = process_manager.get_pid(service.name)
+    else:
+        info = procs.get(service.name)
+        data["running"] = info is not None
+        data["pid"] = info.process.pid if info else None
     return data
 
 
@@ -688,17 +946,18 @@ async def preview_onboard(project: str):
 @app.get("/api/projects")
 async def list_projects():
     """List available projects in ~/Code/."""
+    global _projects_cache
     code_dir = Path.home() / "Code"
-    if not code_dir.exists():
-        return {"projects": []}
-
-    projects = []
-    for item in sorted(code_dir.iterdir()):
-        if item.is_dir() and not item.name.startswith("."):
-            projects.append({
-                "name": item.name,
-                "path": str(item),
-            })
+
+    now = time.monotonic()
+    if _projects_cache and _projects_cache[0] > now and _projects_cache[1] == code_dir:
+        return {"projects": _projects_cache[2]}
+
+    try:
+        projects = await asyncio.to_thread(_scan_projects, code_dir)
+    except FileNotFoundError:
+        projects = []
+    _projects_cache = (now + PROJECTS_CACHE_TTL, code_dir, projects)
     return {"projects": projects}
 
 
@@ -709,7 +968,6 @@ async def chat_with_robot(data: ChatRequest):
 
     Returns Server-Sent Events (SSE) stream.
     """
-    import json
 
     async def event_stream():
         async for event in stream_robot_chat(
@@ -718,7 +976,8 @@ async def chat_with_robot(data: ChatRequest):
             model=data.model,
             session_id=data.session_id,
         ):
-            yield f"data: {json.dumps(event)}\n\n"
+            # Pre-encoded bytes: no str building or utf-8 encode per event
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
 
     return StreamingResponse(
         event_stream(),
@@ -744,7 +1003,7 @@ async def run_service_security_scan(name: str, model: str = "sonnet"):
 
     Returns a job ID that can be polled for results.
     """
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
@@ -782,7 +1041,7 @@ async def get_latest_security_scan(name: str):
 
     Returns the most recent scan job result if available.
     """
-    service = Service.get_or_none(Service.name == name)
+    service = get_service_cached(name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service '{name}' not found")
 
@@ -799,16 +1058,16 @@ async def get_latest_security_scan(name: str):
         "status": job.status.value,
         "result": job.result if job.status == JobStatus.COMPLETED else None,
         "error": job.error if job.status == JobStatus.FAILED else None,
-        "started_at": job.started_at.isoformat() if job.started_at else None,
-        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "started_at": job.started_at,
+        "completed_at": job.completed_at,
     }
 
 
 # Cron Jobs
-@app.post("/api/cron", response_model=CronJobResponse)
+@app.post("/api/cron", responses={200: {"model": CronJobResponse}})
 async def create_cron_job(data: CronJobCreate):
     """Register a new cron job."""
-    if CronJob.get_or_none(CronJob.name == data.name):
+    if get_cron_job_cached(data.name):
         raise HTTPException(status_code=409, detail=f"Cron job '{data.name}' already exists")
 
     # Validate schedule
@@ -816,9 +1075,8 @@ async def create_cron_job(data: CronJobCreate):
     if not valid:
         raise HTTPException(status_code=400, detail=f"Invalid cron schedule: {error}")
 
-    import json
-    watch_dirs_json = json.dumps(data.watch_dirs) if data.watch_dirs else None
-    env_vars_json = json.dumps(data.env_vars) if data.env_vars else None
+    watch_dirs_json = orjson.dumps(data.watch_dirs).decode() if data.watch_dirs else None
+    env_vars_json = orjson.dumps(data.env_vars).decode() if data.env_vars else None
 
     cron_job = CronJob.create(
         name=data.name,
@@ -841,81 +1099,98 @@ async def create_cron_job(data: CronJobCreate):
 @app.get("/api/cron")
 async def list_cron_jobs():
     """List all registered cron jobs."""
-    jobs = []
-    for job in CronJob.select():
-        jobs.append(_cron_job_response(job))
-    return jobs
+    running_ids = cron_manager.running_ids()
+    return [_cron_job_response(job, running_ids) for job in CronJob.select()]
+
+
+# Background tick tasks (referenced so they aren't garbage collected) and
+# the execution IDs produced by the most recently completed tick
+_tick_tasks: set[asyncio.Task] = set()
+last_tick_execution_ids: list[int] = []
+
+
+async def _run_tick():
+    """Run a cron tick and record the execution IDs it started."""
+    global last_tick_execution_ids
+    try:
+        last_tick_execution_ids = await cron_manager.tick()
+    except Exception as e:
+        logger.error(f"Cron tick failed: {e}")
 
 
-@app.post("/api/cron/tick")
+@app.post("/api/cron/tick", status_code=202)
 async def cron_tick():
     """
     Called every minute by system cron to trigger due jobs.
 
+    The tick runs in the background (it waits for jobs to finish), so this
+    returns immediately with the execution IDs of the previous tick.
+
     Add to crontab: * * * * * curl -s -X POST http://localhost:9900/api/cron/tick
     """
-    execution_ids = await cron_manager.tick()
+    task = asyncio.create_task(_run_tick())
+    _tick_tasks.add(task)
+    task.add_done_callback(_tick_tasks.discard)
     return {
-        "status": "ok",
+        "status": "accepted",
         "timestamp": datetime.now().isoformat(),
-        "jobs_started": len(execution_ids),
-        "execution_ids": execution_ids,
+        "last_tick_execution_ids": last_tick_execution_ids,
     }
 
 
 @app.get("/api/cron/status")
-async def get_cron_status():
-    """Get overview of all cron jobs and their status."""
-    jobs = []
-    for job in CronJob.select():
-        # Get last execution
-        last_exec = (
-            CronExecution.select()
-            .where(CronExecution.cron_job == job)
-            .order_by(CronExecution.started_at.desc())
-            .first()
-        )
-
-        # Count recent executions
-        recent_count = (
-            CronExecution.select()
-            .where(
-                CronExecution.cron_job == job,
-                CronExecution.started_at >= datetime.now() - timedelta(hours=24),
-            )
-            .count()
+async def get_cron_status(request: Request):
+    """Get overview of all cron jobs and their status. Supports If-None-Match."""
+    since = datetime.now() - timedelta(hours=24)
+
+    # Success of each job's last execution. SQLite takes bare columns
+    # from the row that produced MAX(), so this is one grouped query.
+    last_success = {
+        row["cron_job"]: row["success"]
+        for row in CronExecution.select(
+            CronExecution.cron_job, CronExecution.success, fn.MAX(CronExecution.started_at)
         )
+        .group_by(CronExecution.cron_job)
+        .dicts()
+    }
 
-        # Count failures
-        recent_failures = (
-            CronExecution.select()
-            .where(
-                CronExecution.cron_job == job,
-                CronExecution.started_at >= datetime.now() - timedelta(hours=24),
-                CronExecution.success == False,
-            )
-            .count()
+    # Execution and failure counts over the last 24 hours, per job
+    recent = {
+        row["cron_job"]: row
+        for row in CronExecution.select(
+            CronExecution.cron_job,
+            fn.COUNT(CronExecution.id).alias("count"),
+            fn.SUM(Case(None, [(CronExecution.success == False, 1)], 0)).alias("failures"),
         )
+        .where(CronExecution.started_at >= since)
+        .group_by(CronExecution.cron_job)
+        .dicts()
+    }
 
+    jobs = []
+    running_ids = cron_manager.running_ids()
+    columns = (CronJob.id, CronJob.name, CronJob.enabled, CronJob.schedule, CronJob.last_run, CronJob.next_run)
+    for job in CronJob.select(*columns).dicts():
+        stats = recent.get(job["id"])
         jobs.append({
-            "name": job.name,
-            "enabled": job.enabled,
-            "schedule": job.schedule,
-            "schedule_description": cron_manager.get_schedule_description(job.schedule),
-            "running": cron_manager.is_running(job.id),
-            "last_run": job.last_run.isoformat() if job.last_run else None,
-            "next_run": job.next_run.isoformat() if job.next_run else None,
-            "last_success": last_exec.success if last_exec else None,
-            "executions_24h": recent_count,
-            "failures_24h": recent_failures,
+            "name": job["name"],
+            "enabled": job["enabled"],
+            "schedule": job["schedule"],
+            "schedule_description": cron_manager.get_schedule_description(job["schedule"]),
+            "running": job["id"] in running_ids,
+            "last_run": job["last_run"],
+            "next_run": job["next_run"],
+            "last_success": last_success.get(job["id"]),
+            "executions_24h": stats["count"] if stats else 0,
+            "failures_24h": stats["failures"] if stats else 0,
         })
 
-    return {
+    return _etag_response(request, {
         "jobs": jobs,
         "total": len(jobs),
         "enabled": sum(1 for j in jobs if j["enabled"]),
         "running": sum(1 for j in jobs if j["running"]),
-    }
+    })
 
 
 @app.get("/api/cron/validate")
@@ -939,19 +1214,19 @@ async def validate_cron_schedule(schedule: str):
     }
 
 
-@app.get("/api/cron/{name}", response_model=CronJobResponse)
+@app.get("/api/cron/{name}", responses={200: {"model": CronJobResponse}})
 async def get_cron_job(name: str):
     """Get a specific cron job."""
-    job = CronJob.get_or_none(CronJob.name == name)
+    job = get_cron_job_cached(name)
     if not job:
         raise HTTPException(status_code=404, detail=f"Cron job '{name}' not found")
     return _cron_job_response(job)
 
 
-@app.put("/api/cron/{name}", response_model=CronJobResponse)
+@app.put("/api/cron/{name}", responses={200: {"model": CronJobResponse}})
 async def update_cron_job(name: str, data: CronJobUpdate):
     """Update a cron job configuration."""
-    job = CronJob.get_or_none(CronJob.name == name)
+    job = get_cron_job_cached(name)
     if not job:
         raise HTTPException(status_code=404, detail=f"Cron job '{name}' not found")
 
@@ -970,34 +1245,34 @@ async def update_cron_job(name: str, data: CronJobUpdate):
     if data.timeout is not None:
         job.timeout = data.timeout
     if data.watch_dirs is not None:
-        import json
-        job.watch_dirs = json.dumps(data.watch_dirs)
+        job.watch_dirs = orjson.dumps(data.watch_dirs).decode()
     if data.env_vars is not None:
-        import json
-        job.env_vars = json.dumps(data.env_vars) if data.env_vars else None
+        job.env_vars = orjson.dumps(data.env_vars).decode() if data.env_vars else None
     if data.env_file is not None:
         job.env_file = data.env_file if data.env_file else None
 
-    job.save()
-    cron_manager.update_next_run(job)
+    # One UPDATE covering just the changed columns (plus next_run/updated_at)
+    cron_manager.update_next_run(job, save=False)
+    job.save(only=[*job.dirty_fields, CronJob.updated_at])
     return _cron_job_response(job)
 
 
 @app.delete("/api/cron/{name}")
 async def delete_cron_job(name: str):
     """Delete a cron job."""
-    job = CronJob.get_or_none(CronJob.name == name)
-    if not job:
+    # Single DELETE ... RETURNING; executions go with it via ON DELETE CASCADE
+    invalidate_cron_job(name)
+    deleted = list(CronJob.delete().where(CronJob.name == name).returning(CronJob.id).execute())
+    if not deleted:
         raise HTTPException(status_code=404, detail=f"Cron job '{name}' not found")
 
-    job.delete_instance(recursive=True)
     return {"status": "deleted", "name": name}
 
 
 @app.post("/api/cron/{name}/run")
 async def run_cron_job_now(name: str):
     """Manually trigger a cron job to run immediately."""
-    job = CronJob.get_or_none(CronJob.name == name)
+    job = get_cron_job_cached(name)
     if not job:
         raise HTTPException(status_code=404, detail=f"Cron job '{name}' not found")
 
@@ -1014,7 +1289,7 @@ async def run_cron_job_now(name: str):
 @app.post("/api/cron/{name}/stop")
 async def stop_cron_job(name: str):
     """Stop a running cron job."""
-    job = CronJob.get_or_none(CronJob.name == name)
+    job = get_cron_job_cached(name)
     if not job:
         raise HTTPException(status_code=404, detail=f"Cron job '{name}' not found")
 
@@ -1028,31 +1303,57 @@ async def stop_cron_job(name: str):
     return {"status": "stopped", "name": name}
 
 
+EXECUTION_OUTPUT_PREVIEW = 1000  # Characters of stdout/stderr per row in execution listings
+
+
 @app.get("/api/cron/{name}/executions")
 async def get_cron_executions(
     name: str,
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
 ):
-    """Get execution history for a cron job."""
-    job = CronJob.get_or_none(CronJob.name == name)
+    """Get execution history for a cron job.
+
+    stdout/stderr are cut to EXECUTION_OUTPUT_PREVIEW characters (with the
+    full lengths alongside); fetch a single execution for the full output.
+    """
+    job = get_cron_job_cached(name)
     if not job:
         raise HTTPException(status_code=404, detail=f"Cron job '{name}' not found")
 
+    # Truncate in SQL so full outputs are never loaded for a listing
+    summary_columns = [
+        field for field in CronExecution._meta.sorted_fields
+        if field.name not in ("stdout", "stderr")
+    ]
     executions = (
-        CronExecution.select()
+        CronExecution.select(
+            *summary_columns,
+            fn.SUBSTR(CronExecution.stdout, 1, EXECUTION_OUTPUT_PREVIEW).alias("stdout"),
+            fn.SUBSTR(CronExecution.stderr, 1, EXECUTION_OUTPUT_PREVIEW).alias("stderr"),
+            fn.LENGTH(CronExecution.stdout).coerce(False).alias("stdout_length"),
+            fn.LENGTH(CronExecution.stderr).coerce(False).alias("stderr_length"),
+        )
         .where(CronExecution.cron_job == job)
         .order_by(CronExecution.started_at.desc())
         .offset(offset)
         .limit(limit)
+        .dicts()
     )
-    return [e.to_dict() for e in executions]
+    # Plain row dicts (to_dict's fields plus output lengths), without building
+    # a model per row; orjson renders the datetimes in the same isoformat
+    result = []
+    for row in executions:
+        row["cron_job_id"] = row.pop("cron_job")
+        row["cron_job_name"] = job.name
+        result.append(row)
+    return result
 
 
 @app.get("/api/cron/{name}/executions/{execution_id}")
-async def get_cron_execution(name: str, execution_id: int):
-    """Get a specific execution record."""
-    job = CronJob.get_or_none(CronJob.name == name)
+async def get_cron_execution(name: str, execution_id: int, request: Request):
+    """Get a specific execution record. Supports If-None-Match once finished."""
+    job = get_cron_job_cached(name)
     if not job:
         raise HTTPException(status_code=404, detail=f"Cron job '{name}' not found")
 
@@ -1062,12 +1363,31 @@ async def get_cron_execution(name: str, execution_id: int):
     if not execution:
         raise HTTPException(status_code=404, detail=f"Execution {execution_id} not found")
 
-    return execution.to_dict()
+    # A finished execution only changes when the auto-fixer records its
+    # outcome, so those fields identify its version without rendering it
+    headers = None
+    if execution.finished_at:
+        etag = (
+            f'W/"{execution.id}-{int(execution.finished_at.timestamp())}'
+            f'-{execution.fix_attempted:d}-{execution.fix_success}"'
+        )
+        if etag in (request.headers.get("if-none-match") or ""):
+            return Response(status_code=304, headers={"ETag": etag})
+        headers = {"ETag": etag}
+
+    execution.cron_job = job
+    return ORJSONResponse(execution.to_dict(), headers=headers)
+
 
+def _cron_job_response(job: CronJob, running_ids: set[int] | None = None) -> dict:
+    """Convert cron job to response dict with runtime info.
 
-def _cron_job_response(job: CronJob) -> dict:
-    """Convert cron job to response dict with runtime info."""
+    running_ids is an optional cron_manager.running_ids() to avoid per-job lookups.
+    """
     data = job.to_dict()
-    data["running"] = cron_manager.is_running(job.id)
+    if running_ids is None:
+        data["running"] = cron_manager.is_running(job.id)
+    else:
+        data["running"] = job.id in running_ids
     data["schedule_description"] = cron_manager.get_schedule_description(job.schedule)
     return data
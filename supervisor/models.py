@@ -5,9 +5,13 @@ Uses Peewee ORM with SQLite. Stores service definitions, log entries,
 resource metrics, auto-fix attempt history, and cron job schedules with execution history.
 """
 
+import asyncio
+import copy
+import functools
 import os
 from datetime import datetime
 
+import orjson
 from peewee import (
     AutoField,
     BooleanField,
@@ -34,17 +38,63 @@ def initialize_db():
         str(config.db_path),
         pragmas={
             "journal_mode": "wal",
+            "synchronous": 1,  # NORMAL: fsync on checkpoint only, safe with WAL
+            "temp_store": 2,  # MEMORY
+            "mmap_size": 256 * 1024 * 1024,
+            "wal_autocheckpoint": 1000,  # Pages; pinned so WAL growth stays bounded under write bursts
             "cache_size": -64 * 1000,
             "foreign_keys": 1,
             "busy_timeout": 5000,
         },
+        cached_statements=256,  # sqlite3 per-connection prepared statement cache (default 128)
     )
     database.initialize(db)
     database.create_tables([Service, LogEntry, Metric, FixAttempt, CronJob, CronExecution], safe=True)
 
 
+def _loads_safe(value: str, default):
+    """Decode a JSON text column, returning default if it is malformed.
+
+    Decoding is cached by the raw text (rows are re-read every monitor tick
+    with the same values); callers get a shallow copy they may modify.
+    """
+    if not isinstance(value, str):
+        return default
+    decoded = _decode_json_text(value)
+    return default if decoded is None else copy.copy(decoded)
+
+
+@functools.lru_cache(maxsize=1024)
+def _decode_json_text(value: str):
+    """orjson.loads, with None for malformed input."""
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def write_transaction():
+    """Transaction that takes SQLite's write lock up front (BEGIN IMMEDIATE).
+
+    Log flushes run on worker threads while the loop writes on its own
+    connection. A deferred transaction that has to upgrade to a write lock
+    fails with "database is locked" straight away; IMMEDIATE queues on
+    busy_timeout instead.
+    """
+    return database.atomic("IMMEDIATE")
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking database call in a worker thread to keep the event loop free."""
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
 class BaseModel(Model):
-    """Base model with common configuration."""
+    """Base model with common configuration.
+
+    to_dict() leaves datetimes as datetime objects; API responses are
+    rendered with orjson, which emits them in isoformat.
+    """
 
     class Meta:
         database = database
@@ -78,11 +128,7 @@ class Service(BaseModel):
         if not self.watch_dirs:
             # Default to working_dir if set
             return [self.working_dir] if self.working_dir else []
-        import json
-        try:
-            return json.loads(self.watch_dirs)
-        except (json.JSONDecodeError, TypeError):
-            return []
+        return _loads_safe(self.watch_dirs, [])
 
     def to_dict(self) -> dict:
         return {
@@ -96,8 +142,8 @@ class Service(BaseModel):
             "caddy_subdomain": self.caddy_subdomain,
             "caddy_path": self.caddy_path,
             "watch_dirs": self.get_watch_dirs(),
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 
@@ -112,6 +158,12 @@ class LogEntry(BaseModel):
 
     class Meta:
         table_name = "log_entries"
+        # Serve per-service (and per-level) "latest N" lookups without a sort;
+        # created on existing databases by create_tables(safe=True)
+        indexes = (
+            (("service", "level", "timestamp"), False),
+            (("service", "timestamp"), False),
+        )
 
     def to_dict(self) -> dict:
         return {
@@ -119,7 +171,7 @@ class LogEntry(BaseModel):
             "service_id": self.service_id,
             "level": self.level,
             "message": self.message,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "timestamp": self.timestamp,
         }
 
 
@@ -135,6 +187,7 @@ class Metric(BaseModel):
 
     class Meta:
         table_name = "metrics"
+        indexes = ((("service", "timestamp"), False),)  # Per-service history ranges
 
     def to_dict(self) -> dict:
         return {
@@ -143,7 +196,7 @@ class Metric(BaseModel):
             "cpu_percent": self.cpu_percent,
             "memory_mb": self.memory_mb,
             "disk_mb": self.disk_mb,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "timestamp": self.timestamp,
         }
 
 
@@ -174,7 +227,7 @@ class FixAttempt(BaseModel):
             "backup_path": self.backup_path,
             "restored": self.restored,
             "can_restore": bool(self.backup_path and not self.restored),
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "timestamp": self.timestamp,
         }
 
 
@@ -207,21 +260,13 @@ class CronJob(BaseModel):
         """Get list of directories to watch for disk usage."""
         if not self.watch_dirs:
             return [self.working_dir] if self.working_dir else []
-        import json
-        try:
-            return json.loads(self.watch_dirs)
-        except (json.JSONDecodeError, TypeError):
-            return []
+        return _loads_safe(self.watch_dirs, [])
 
     def get_env_vars(self) -> dict[str, str]:
         """Get environment variables as a dict."""
         if not self.env_vars:
             return {}
-        import json
-        try:
-            return json.loads(self.env_vars)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return _loads_safe(self.env_vars, {})
 
     def to_dict(self) -> dict:
         return {
@@ -235,10 +280,10 @@ class CronJob(BaseModel):
             "watch_dirs": self.get_watch_dirs(),
             "env_vars": self.get_env_vars(),
             "env_file": self.env_file,
-            "last_run": self.last_run.isoformat() if self.last_run else None,
-            "next_run": self.next_run.isoformat() if self.next_run else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "last_run": self.last_run,
+            "next_run": self.next_run,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 
@@ -261,14 +306,15 @@ class CronExecution(BaseModel):
 
     class Meta:
         table_name = "cron_executions"
+        indexes = ((("cron_job", "started_at"), False),)  # Per-job history, newest first
 
     def to_dict(self) -> dict:
         return {
             "id": self.id,
             "cron_job_id": self.cron_job_id,
             "cron_job_name": self.cron_job.name if self.cron_job else None,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
             "exit_code": self.exit_code,
             "stdout": self.stdout,
             "stderr": self.stderr,
@@ -9,40 +9,110 @@ of old log entries, metrics, and cron execution records.
 import asyncio
 import logging
 import os
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import psutil
+from peewee import chunked
 
 from .config import config
-from .models import CronExecution, LogEntry, Metric, Service, database
-from .process import process_manager
+from .models import CronExecution, LogEntry, Metric, Service, write_transaction
+from .process import ProcessInfo, process_manager
 
 logger = logging.getLogger(__name__)
 
 
 def get_directory_size(path: str) -> float:
     """Get total size of a directory in MB."""
+    # scandir entries carry the file type from readdir, so only files cost a
+    # stat() call; like os.walk, symlinked directories are not descended into
     total = 0
-    try:
-        for dirpath, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                try:
-                    total += os.path.getsize(filepath)
-                except (OSError, FileNotFoundError):
-                    pass
-    except (OSError, PermissionError):
-        pass
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            total += entry.stat().st_size
+                    except OSError:
+                        pass
+        except OSError:
+            pass
     return total / 1024 / 1024  # Convert to MB
 
 
+CLEANUP_BATCH = 1000  # Rows per DELETE transaction when purging old data
+METRIC_INSERT_BATCH = 100  # Rows per INSERT (5 columns each)
+CPU_SAMPLE_SECONDS = 0.1  # Window for cpu_percent, shared by a process and its children
+
+
+def process_children_map() -> dict[int, list[psutil.Process]]:
+    """Map each pid to its direct children, from one pass over the process table."""
+    children_of = defaultdict(list)
+    for proc in psutil.process_iter(["ppid"]):
+        children_of[proc.info["ppid"]].append(proc)
+    return children_of
+
+
+def sample_process_tree(
+    pid: int, children_of: dict[int, list[psutil.Process]] | None = None
+) -> tuple[float, float, int]:
+    """Sample CPU and memory for a process and its children (blocking).
+
+    Every process is primed first and read after one shared sleep, so the
+    cost is one CPU_SAMPLE_SECONDS window regardless of child count.
+    children_of is an optional process_children_map() shared by several
+    calls, saving each one its own scan of the process table.
+    Returns (cpu_percent, memory_mb, child_count). Raises psutil errors
+    for the parent process.
+    """
+    proc = psutil.Process(pid)
+    if children_of is None:
+        try:
+            children = proc.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            children = []
+    else:
+        children = []
+        stack = list(children_of.get(pid, ()))
+        while stack:
+            child = stack.pop()
+            children.append(child)
+            stack.extend(children_of.get(child.pid, ()))
+
+    procs = [proc]
+    proc.cpu_percent(interval=None)
+    for child in children:
+        try:
+            child.cpu_percent(interval=None)
+            procs.append(child)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    time.sleep(CPU_SAMPLE_SECONDS)
+
+    cpu_percent = proc.cpu_percent(interval=None)
+    memory_mb = proc.memory_info().rss / 1024 / 1024
+    for child in procs[1:]:
+        try:
+            cpu_percent += child.cpu_percent(interval=None)
+            memory_mb += child.memory_info().rss / 1024 / 1024
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return cpu_percent, memory_mb, len(children)
+
+
 class ResourceMonitor:
     """Monitors resource usage of supervised services."""
 
     def __init__(self):
         self._running = False
         self._task = None
+        self._latest: dict[str, dict] = {}  # service -> last collected sample
 
     async def start(self):
         """Start the monitoring loop."""
@@ -78,48 +148,39 @@ class ResourceMonitor:
     async def _collect_metrics(self):
         """Collect metrics for all enabled services."""
         # Collect for all enabled services (not just running ones for disk)
-        for service in Service.select().where(Service.enabled == True):
+        services = list(Service.select().where(Service.enabled == True))
+
+        # One process table scan serves every service's child lookup
+        children_of = await asyncio.to_thread(process_children_map)
+
+        # Sampling blocks (cpu_percent intervals, directory walks), so sample
+        # every service concurrently in worker threads, off the event loop
+        samples = await asyncio.gather(
+            *(asyncio.to_thread(self._sample_service, service, children_of) for service in services),
+            return_exceptions=True,
+        )
+
+        latest = {}
+        rows = []
+        for service, sample in zip(services, samples):
+            if isinstance(sample, BaseException):
+                logger.error(f"Error collecting metrics for {service.name}: {sample}")
+                continue
             try:
-                cpu_percent = 0.0
-                memory_mb = 0.0
-
-                # Get process metrics if running
-                if process_manager.is_running(service.name):
-                    pid = process_manager.get_pid(service.name)
-                    if pid:
-                        try:
-                            proc = psutil.Process(pid)
-                            cpu_percent = proc.cpu_percent(interval=0.1)
-                            memory_info = proc.memory_info()
-                            memory_mb = memory_info.rss / 1024 / 1024
-
-                            # Also collect child processes
-                            try:
-                                children = proc.children(recursive=True)
-                                for child in children:
-                                    cpu_percent += child.cpu_percent(interval=0.1)
-                                    memory_mb += child.memory_info().rss / 1024 / 1024
-                            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                                pass
-
-                        except psutil.NoSuchProcess:
-                            logger.warning(f"Process for {service.name} no longer exists")
-                        except psutil.AccessDenied:
-                            logger.warning(f"Access denied for {service.name}")
-
-                # Collect disk usage for watched directories
-                disk_mb = 0.0
-                watch_dirs = service.get_watch_dirs()
-                for dir_path in watch_dirs:
-                    if dir_path and os.path.isdir(dir_path):
-                        disk_mb += get_directory_size(dir_path)
-
-                Metric.create(
-                    service=service,
-                    cpu_percent=cpu_percent,
-                    memory_mb=memory_mb,
-                    disk_mb=disk_mb if disk_mb > 0 else None,
-                )
+                cpu_percent, memory_mb, child_count, disk_mb, watch_dirs = sample
+                rows.append({
+                    "service": service.id,
+                    "cpu_percent": cpu_percent,
+                    "memory_mb": memory_mb,
+                    "disk_mb": disk_mb if disk_mb > 0 else None,
+                })
+                latest[service.name] = {
+                    "cpu_percent": round(cpu_percent, 1),
+                    "memory_mb": round(memory_mb, 1),
+                    "disk_mb": round(disk_mb, 1),
+                    "child_processes": child_count,
+                    "watch_dirs": watch_dirs,
+                }
                 logger.debug(
                     f"Metrics for {service.name}: CPU={cpu_percent:.1f}%, "
                     f"MEM={memory_mb:.1f}MB, DISK={disk_mb:.1f}MB"
@@ -128,31 +189,90 @@ class ResourceMonitor:
             except Exception as e:
                 logger.error(f"Error collecting metrics for {service.name}: {e}")
 
+        # One transaction for all rows; batches stay under SQLite's variable limit
+        with write_transaction():
+            for batch in chunked(rows, METRIC_INSERT_BATCH):
+                Metric.insert_many(batch).execute()
+
+        self._latest = latest
+
+    def _sample_service(
+        self, service: Service, children_of: dict[int, list[psutil.Process]]
+    ) -> tuple[float, float, int, float, list[str]]:
+        """Sample one service's process and disk usage (blocking).
+
+        Returns (cpu_percent, memory_mb, child_count, disk_mb, watch_dirs).
+        """
+        cpu_percent = 0.0
+        memory_mb = 0.0
+        child_count = 0
+
+        # Get process metrics if running
+        if process_manager.is_running(service.name):
+            pid = process_manager.get_pid(service.name)
+            if pid:
+                try:
+                    cpu_percent, memory_mb, child_count = sample_process_tree(pid, children_of)
+                except psutil.NoSuchProcess:
+                    logger.warning(f"Process for {service.name} no longer exists")
+                except psutil.AccessDenied:
+                    logger.warning(f"Access denied for {service.name}")
+
+        # Collect disk usage for watched directories
+        disk_mb = 0.0
+        watch_dirs = service.get_watch_dirs()
+        for dir_path in watch_dirs:
+            if dir_path and os.path.isdir(dir_path):
+                disk_mb += get_directory_size(dir_path)
+
+        return cpu_percent, memory_mb, child_count, disk_mb, watch_dirs
+
     async def _cleanup_old_data(self):
         """Remove old log entries, metrics, and cron executions."""
         try:
             cutoff = datetime.now() - timedelta(days=config.log_retention_days)
 
             # Clean old log entries
-            deleted_logs = LogEntry.delete().where(LogEntry.timestamp < cutoff).execute()
+            deleted_logs = await self._delete_in_batches(LogEntry, LogEntry.timestamp < cutoff)
             if deleted_logs:
                 logger.debug(f"Cleaned up {deleted_logs} old log entries")
 
             # Clean old metrics
-            deleted_metrics = Metric.delete().where(Metric.timestamp < cutoff).execute()
+            deleted_metrics = await self._delete_in_batches(Metric, Metric.timestamp < cutoff)
             if deleted_metrics:
                 logger.debug(f"Cleaned up {deleted_metrics} old metrics")
 
             # Clean old cron executions
-            deleted_cron = CronExecution.delete().where(CronExecution.started_at < cutoff).execute()
+            deleted_cron = await self._delete_in_batches(CronExecution, CronExecution.started_at < cutoff)
             if deleted_cron:
                 logger.debug(f"Cleaned up {deleted_cron} old cron executions")
 
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}")
 
+    async def _delete_in_batches(self, model, condition) -> int:
+        """Delete matching rows in short transactions of CLEANUP_BATCH rows.
+
+        Keeps each write lock brief so readers and the log writer are not
+        stalled behind one large DELETE. Returns the number of rows deleted.
+        """
+        total = 0
+        while True:
+            # DELETE ... LIMIT needs a compile-time SQLite option, so limit via a subquery
+            batch = model.select(model.id).where(condition).limit(CLEANUP_BATCH)
+            with write_transaction():
+                deleted = model.delete().where(model.id.in_(batch)).execute()
+            total += deleted
+            if deleted < CLEANUP_BATCH:
+                return total
+            await asyncio.sleep(0)  # Let other tasks run between batches
+
     def get_current_metrics(self, service_name: str) -> dict | None:
-        """Get current resource usage for a service."""
+        """Get current resource usage for a service.
+
+        Blocks while sampling CPU and walking watch dirs; call it from a
+        worker thread (asyncio.to_thread) when on the event loop.
+        """
         service = Service.get_or_none(Service.name == service_name)
         if not service:
             return None
@@ -171,22 +291,7 @@ class ResourceMonitor:
         pid = process_manager.get_pid(service_name)
         if pid:
             try:
-                proc = psutil.Process(pid)
-                cpu_percent = proc.cpu_percent(interval=0.1)
-                memory_info = proc.memory_info()
-                memory_mb = memory_info.rss / 1024 / 1024
-
-                # Include children
-                child_count = 0
-                try:
-                    children = proc.children(recursive=True)
-                    child_count = len(children)
-                    for child in children:
-                        cpu_percent += child.cpu_percent(interval=0.1)
-                        memory_mb += child.memory_info().rss / 1024 / 1024
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-
+                cpu_percent, memory_mb, child_count = sample_process_tree(pid)
                 info = process_manager.get_info(service_name)
 
                 result.update({
@@ -212,6 +317,32 @@ class ResourceMonitor:
 
         return result
 
+    def snapshot(self, procs: dict[str, ProcessInfo] | None = None) -> dict[str, dict]:
+        """Get the last collected metrics for all sampled services.
+
+        Same shape as get_current_metrics, but served from the monitor loop's
+        latest sample instead of sampling again. Process fields come from
+        procs (a process_manager.snapshot()), fetched if not given.
+        """
+        if procs is None:
+            procs = process_manager.snapshot()
+        now = datetime.now()
+
+        result = {}
+        for name, sample in self._latest.items():
+            info = procs.get(name)
+            result[name] = {
+                "pid": info.process.pid if info else None,
+                "cpu_percent": sample["cpu_percent"] if info else 0.0,
+                "memory_mb": sample["memory_mb"] if info else 0.0,
+                "disk_mb": sample["disk_mb"],
+                "child_processes": sample["child_processes"] if info else 0,
+                "uptime_seconds": (now - info.started_at).total_seconds() if info else 0,
+                "restart_count": info.restart_count if info else 0,
+                "watch_dirs": sample["watch_dirs"],
+            }
+        return result
+
 
 # Global monitor instance
 resource_monitor = ResourceMonitor()
@@ -6,8 +6,12 @@ to log files and monitors for crashes with automatic restart capability.
 """
 
 import asyncio
+import functools
 import logging
 import os
+import re
+import select
+import selectors
 import shlex
 import signal
 import subprocess
@@ -35,44 +39,220 @@ class ProcessInfo:
     last_restart: datetime = None
 
 
+@dataclass(eq=False)
+class _OutputStream:
+    """Per-pipe state for the shared reader thread."""
+
+    service_name: str
+    stream: object
+    level: str
+    log_fd: int  # O_APPEND log file, written with os.writev
+    stop_event: threading.Event
+    process: subprocess.Popen | None = None  # Set on stdout when there is no pidfd; its EOF reports the exit
+    buffer: bytes = b""  # Trailing partial line from the last read
+    pending: list[bytes] = field(default_factory=list)  # Log entries not yet written
+    unflushed: int = 0  # Bytes in pending
+    last_flush: float = field(default_factory=time.monotonic)
+
+
+@dataclass(eq=False)
+class _ExitWatch:
+    """A service's pidfd, watched by the reader thread to report its exit."""
+
+    service_name: str
+    pidfd: int
+    process: subprocess.Popen
+    stop_event: threading.Event
+
+
+READ_CHUNK_SIZE = 65536  # Bytes per os.read() from a service pipe
+READER_SELECT_TIMEOUT = 0.5  # Seconds between reader wakeups when all pipes are idle
+LOG_FLUSH_INTERVAL = 0.25  # Max seconds a log line may sit unwritten
+LOG_FLUSH_BYTES = 65536  # Write early once this much is pending
+LOG_FLUSH_CHUNKS = 512  # ...or once this many reads are pending (stays under IOV_MAX)
+LOG_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC
+RESTART_CONCURRENCY = 4  # Crashed services started at once during a restart storm
+
+
+def _open_pidfd(pid: int) -> int | None:
+    """Open a pidfd for a process, or None where unsupported (Linux < 5.3)."""
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+def _wait_exit(process: subprocess.Popen, timeout: float, pidfd: int | None = None) -> int:
+    """Like process.wait(timeout), but sleeps on the pidfd when one is given.
+
+    Popen.wait polls waitpid with growing sleeps; a pidfd becomes readable
+    the moment the process exits. Raises subprocess.TimeoutExpired.
+    """
+    if pidfd is None:
+        return process.wait(timeout=timeout)
+    poller = select.poll()
+    poller.register(pidfd, select.POLLIN)
+    if not poller.poll(timeout * 1000):
+        raise subprocess.TimeoutExpired(process.args, timeout)
+    return process.wait()  # Already exited; just reap
+
+
+def _wait_all_exit(processes: list[subprocess.Popen], timeout: float) -> list[subprocess.Popen]:
+    """Wait for several processes at once; returns those still running at timeout.
+
+    All pidfds go into one poll() set, so the total wait is the slowest
+    exit rather than the sum; processes without a pidfd fall back to wait().
+    """
+    deadline = time.monotonic() + timeout
+    poller = select.poll()
+    by_fd: dict[int, subprocess.Popen] = {}
+    fallback = []
+    for process in processes:
+        pidfd = _open_pidfd(process.pid)
+        if pidfd is None:
+            fallback.append(process)
+        else:
+            by_fd[pidfd] = process
+            poller.register(pidfd, select.POLLIN)
+
+    try:
+        while by_fd:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for pidfd, _ in poller.poll(remaining * 1000):
+                poller.unregister(pidfd)
+                os.close(pidfd)
+                by_fd.pop(pidfd).wait()  # Reap
+    finally:
+        for pidfd in by_fd:
+            os.close(pidfd)
+
+    alive = list(by_fd.values())
+    for process in fallback:
+        try:
+            process.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            alive.append(process)
+    return alive
+
+
+@functools.lru_cache(maxsize=256)
+def _split_command(command: str) -> tuple[str, ...]:
+    """Tokenize a service command; cached since restarts reuse the same commands."""
+    return tuple(shlex.split(command))
+
+
+# A whitespace-delimited token containing "/" and ending in .py
+_SCRIPT_PATH_RE = re.compile(r"(?<!\S)\S*/\S*\.py(?!\S)")
+
+
+@functools.lru_cache(maxsize=256)
+def _guess_working_dir(command: str) -> str | None:
+    """Infer a working directory from a script path in the command, if any."""
+    if not any(c in command for c in "'\"\\"):
+        # Without quotes or escapes shlex tokens are just the whitespace-split words
+        match = _SCRIPT_PATH_RE.search(command)
+        return str(Path(match.group()).parent) if match else None
+    for part in _split_command(command):
+        if part.endswith(".py") and "/" in part:
+            return str(Path(part).parent)
+    return None
+
+
+def _write_all(fd: int, chunks: list[bytes]):
+    """Write chunks to fd with as few writev() calls as possible."""
+    while chunks:
+        written = os.writev(fd, chunks)
+        while chunks and written >= len(chunks[0]):
+            written -= len(chunks[0])
+            chunks = chunks[1:]
+        if written:
+            chunks = [chunks[0][written:], *chunks[1:]]
+
+
+def _signal_group(process: subprocess.Popen, sig: int):
+    """Send a signal to a process's group, ignoring processes already gone."""
+    try:
+        os.killpg(os.getpgid(process.pid), sig)
+    except ProcessLookupError:
+        pass
+
+
 class ProcessManager:
     """Manages supervised service processes."""
 
     def __init__(self):
+        # Copy-on-write: replaced wholesale under _lock, read without it
         self._processes: dict[str, ProcessInfo] = {}
-        self._log_threads: dict[str, threading.Thread] = {}
         self._stop_events: dict[str, threading.Event] = {}
-        self._lock = threading.Lock()
+        self._lock = threading.Lock()  # Serializes writers
         self._on_log: Callable[[str, str, str], None] = None
+        self._on_log_batch: Callable[[list[tuple[str, str, str]]], None] = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._selector = selectors.DefaultSelector()
+        self._reader_thread: threading.Thread | None = None
+        self._unflushed: set[_OutputStream] = set()  # Touched only by the reader thread
+        self._restart_tasks: dict[str, asyncio.Task] = {}  # Pending crash restarts by service
+        self._restart_slots = asyncio.Semaphore(RESTART_CONCURRENCY)
+        self.crash_event = asyncio.Event()  # Set when a service process exits unexpectedly
 
     def set_log_callback(self, callback: Callable[[str, str, str], None]):
         """Set callback for log entries: callback(service_name, level, message)."""
         self._on_log = callback
 
+    def set_log_batch_callback(self, callback: Callable[[list[tuple[str, str, str]]], None]):
+        """Set callback for batches of log entries: callback([(service_name, level, message), ...]).
+
+        Called once per read from a service pipe; takes precedence over the
+        per-line callback.
+        """
+        self._on_log_batch = callback
+
+    def set_event_loop(self, loop: asyncio.AbstractEventLoop):
+        """Set the loop that crash_event belongs to (it is set from the reader thread)."""
+        self._loop = loop
+
+    def _add_process(self, info: ProcessInfo):
+        with self._lock:
+            self._processes = {**self._processes, info.service_name: info}
+
+    def _remove_processes(self, *names: str):
+        with self._lock:
+            if any(name in self._processes for name in names):
+                self._processes = {n: i for n, i in self._processes.items() if n not in names}
+
+    def _notify_exit(self):
+        """Wake the crash monitor from the reader thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self.crash_event.set)
+        except RuntimeError:
+            pass  # Loop already closed
+
     def start(self, service: Service) -> bool:
         """Start a service process. Returns True if started successfully."""
         if self.is_running(service.name):
             logger.info(f"Service {service.name} is already running")
             return True
 
+        # Descriptors we still own; set to None once handed to the reader thread
+        stdout_log = stderr_log = pidfd = None
         try:
             # Create log directory for this service
             log_dir = config.logs_dir / service.name
             log_dir.mkdir(parents=True, exist_ok=True)
 
             # Determine working directory
-            working_dir = service.working_dir
-            if not working_dir:
-                # Try to extract from command
-                parts = shlex.split(service.command)
-                for part in parts:
-                    if part.endswith(".py") and "/" in part:
-                        working_dir = str(Path(part).parent)
-                        break
+            working_dir = service.working_dir or _guess_working_dir(service.command)
 
             # Open log files
-            stdout_log = open(log_dir / "stdout.log", "a")
-            stderr_log = open(log_dir / "stderr.log", "a")
+            stdout_log = os.open(log_dir / "stdout.log", LOG_OPEN_FLAGS, 0o644)
+            stderr_log = os.open(log_dir / "stderr.log", LOG_OPEN_FLAGS, 0o644)
 
             # Parse command
             if service.command.startswith("cd "):
@@ -81,89 +261,110 @@ class ProcessManager:
                 cmd = service.command
             else:
                 shell = False
-                cmd = shlex.split(service.command)
+                cmd = list(_split_command(service.command))
 
-            # Start process
-            env = os.environ.copy()
+            # Start process (inherits our environment; Services have no env overrides)
             process = subprocess.Popen(
                 cmd,
                 shell=shell,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 cwd=working_dir,
-                env=env,
                 start_new_session=True,  # Create new process group
             )
 
-            with self._lock:
-                self._processes[service.name] = ProcessInfo(
-                    service_name=service.name,
-                    process=process,
-                )
+            self._add_process(ProcessInfo(service_name=service.name, process=process))
 
-            # Start log capture threads
+            # Hand both pipes to the shared reader thread
             stop_event = threading.Event()
             self._stop_events[service.name] = stop_event
 
-            stdout_thread = threading.Thread(
-                target=self._capture_output,
-                args=(service.name, process.stdout, "info", stdout_log, stop_event),
-                daemon=True,
+            # The pidfd reports the exit even if a grandchild keeps stdout open;
+            # without one, stdout's EOF stands in for it
+            pidfd = _open_pidfd(process.pid)
+            self._register_stream(
+                _OutputStream(
+                    service.name, process.stdout, "info", stdout_log, stop_event,
+                    process if pidfd is None else None,
+                )
             )
-            stderr_thread = threading.Thread(
-                target=self._capture_output,
-                args=(service.name, process.stderr, "error", stderr_log, stop_event),
-                daemon=True,
+            stdout_log = None
+            self._register_stream(
+                _OutputStream(service.name, process.stderr, "error", stderr_log, stop_event)
             )
-
-            stdout_thread.start()
-            stderr_thread.start()
+            stderr_log = None
+            if pidfd is not None:
+                self._selector.register(
+                    pidfd, selectors.EVENT_READ, data=_ExitWatch(service.name, pidfd, process, stop_event)
+                )
+                pidfd = None
 
             logger.info(f"Started service {service.name} with PID {process.pid}")
             return True
 
         except Exception as e:
             logger.error(f"Failed to start service {service.name}: {e}")
+            for fd in (stdout_log, stderr_log, pidfd):
+                if fd is not None:
+                    os.close(fd)
             return False
 
+    def cancel_restart(self, service_name: str):
+        """Drop a pending crash restart for a service, if one is scheduled.
+
+        Safe to call from any thread; the task is cancelled on its own loop.
+        """
+        task = self._restart_tasks.pop(service_name, None)
+        if task is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is task.get_loop():
+            task.cancel()
+        else:
+            try:
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # Loop already closed
+
     def stop(self, service_name: str, timeout: int = 10) -> bool:
         """Stop a service process. Returns True if stopped successfully."""
-        with self._lock:
-            info = self._processes.get(service_name)
-
+        # A crashed service waiting out its backoff must not come back after a stop
+        self.cancel_restart(service_name)
+        info = self._processes.get(service_name)
         if not info:
             logger.info(f"Service {service_name} is not running")
             return True
 
         try:
-            # Signal stop to log threads
+            # Mark the exit as requested so the reader does not report a crash
             if service_name in self._stop_events:
                 self._stop_events[service_name].set()
 
             process = info.process
+            pidfd = _open_pidfd(process.pid)
 
-            # Try graceful shutdown first (SIGTERM)
             try:
-                os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-            except ProcessLookupError:
-                pass
+                # Try graceful shutdown first (SIGTERM)
+                _signal_group(process, signal.SIGTERM)
 
-            # Wait for process to terminate
-            try:
-                process.wait(timeout=timeout)
-            except subprocess.TimeoutExpired:
-                # Force kill
-                logger.warning(f"Service {service_name} did not stop gracefully, forcing kill")
+                # Wait for process to terminate
                 try:
-                    os.killpg(os.getpgid(process.pid), signal.SIGKILL)
-                except ProcessLookupError:
-                    pass
-                process.wait(timeout=5)
-
+                    _wait_exit(process, timeout, pidfd)
+                except subprocess.TimeoutExpired:
+                    # Force kill
+                    logger.warning(f"Service {service_name} did not stop gracefully, forcing kill")
+                    _signal_group(process, signal.SIGKILL)
+                    _wait_exit(process, 5, pidfd)
+            finally:
+                if pidfd is not None:
+                    os.close(pidfd)
+
+            self._remove_processes(service_name)
             with self._lock:
-                del self._processes[service_name]
-                if service_name in self._stop_events:
-                    del self._stop_events[service_name]
+                self._stop_events.pop(service_name, None)
 
             logger.info(f"Stopped service {service_name}")
             return True
@@ -178,11 +379,15 @@ class ProcessManager:
         time.sleep(config.restart_delay)
         return self.start(service)
 
+    async def restart_async(self, service: Service) -> bool:
+        """Restart a service without blocking the event loop."""
+        await asyncio.to_thread(self.stop, service.name)
+        await asyncio.sleep(config.restart_delay)
+        return await asyncio.to_thread(self.start, service)
+
     def is_running(self, service_name: str) -> bool:
         """Check if a service is running."""
-        with self._lock:
-            info = self._processes.get(service_name)
-
+        info = self._processes.get(service_name)
         if not info:
             return False
 
@@ -191,9 +396,7 @@ class ProcessManager:
 
     def get_pid(self, service_name: str) -> int | None:
         """Get the PID of a running service."""
-        with self._lock:
-            info = self._processes.get(service_name)
-
+        info = self._processes.get(service_name)
         if not info:
             return None
 
@@ -203,69 +406,213 @@ class ProcessManager:
 
     def get_info(self, service_name: str) -> ProcessInfo | None:
         """Get process info for a service."""
-        with self._lock:
-            return self._processes.get(service_name)
+        return self._processes.get(service_name)
+
+    def snapshot(self) -> dict[str, ProcessInfo]:
+        """Get info for all running services from one consistent view."""
+        return {name: info for name, info in self._processes.items() if info.process.poll() is None}
 
     def get_all_running(self) -> list[str]:
         """Get list of all running service names."""
+        return [name for name, info in self._processes.items() if info.process.poll() is None]
+
+    def _register_stream(self, output: _OutputStream):
+        """Watch a service pipe from the reader thread, starting it on first use."""
+        os.set_blocking(output.stream.fileno(), False)
+        self._selector.register(output.stream, selectors.EVENT_READ, data=output)
+        self._ensure_reader()
+
+    def _ensure_reader(self):
         with self._lock:
-            return [name for name, info in self._processes.items() if info.process.poll() is None]
-
-    def _capture_output(
-        self,
-        service_name: str,
-        stream,
-        level: str,
-        log_file,
-        stop_event: threading.Event,
-    ):
-        """Capture process output and write to log file and database."""
-        try:
-            for line in iter(stream.readline, b""):
-                if stop_event.is_set():
-                    break
+            if self._reader_thread is None:
+                self._reader_thread = threading.Thread(
+                    target=self._read_loop, name="service-output", daemon=True
+                )
+                self._reader_thread.start()
 
+    def _read_loop(self):
+        """Demultiplex output from every service pipe, and exits, on one thread."""
+        while True:
+            timeout = LOG_FLUSH_INTERVAL if self._unflushed else READER_SELECT_TIMEOUT
+            try:
+                events = self._selector.select(timeout=timeout)
+            except Exception as e:
+                logger.error(f"Error in log capture: {e}")
+                time.sleep(READER_SELECT_TIMEOUT)
+                continue
+            # One misbehaving stream is dropped; the thread serves every service
+            for key, _ in events:
                 try:
-                    decoded = line.decode("utf-8", errors="replace").rstrip()
-                    if not decoded:
-                        continue
-
-                    # Write to log file
-                    timestamp = datetime.now().isoformat()
-                    log_file.write(f"[{timestamp}] {decoded}\n")
-                    log_file.flush()
-
-                    # Detect error level from content
-                    detected_level = level
-                    lower = decoded.lower()
-                    if "error" in lower or "exception" in lower or "traceback" in lower:
-                        detected_level = "error"
-                    elif "warning" in lower or "warn" in lower:
-                        detected_level = "warning"
-
-                    # Call callback if set
-                    if self._on_log:
-                        self._on_log(service_name, detected_level, decoded)
-
-                except Exception as e:
-                    logger.error(f"Error processing log line for {service_name}: {e}")
-
-        except Exception as e:
-            logger.error(f"Error in log capture for {service_name}: {e}")
-        finally:
+                    if isinstance(key.data, _ExitWatch):
+                        self._handle_exit(key.data)
+                    else:
+                        self._read_stream(key.data)
+                except Exception:
+                    logger.exception(f"Error in log capture for {key.data.service_name}")
+                    self._drop_watch(key.data)
+            if self._unflushed:
+                self._flush_logs()
+
+    def _flush_logs(self):
+        """Write out log entries that have been pending longer than LOG_FLUSH_INTERVAL."""
+        now = time.monotonic()
+        for output in list(self._unflushed):
+            if now - output.last_flush >= LOG_FLUSH_INTERVAL:
+                try:
+                    self._flush_log(output, now)
+                except Exception:
+                    logger.exception(f"Error flushing logs for {output.service_name}")
+                    self._drop_watch(output)
+
+    def _drop_watch(self, data: "_OutputStream | _ExitWatch"):
+        """Best-effort teardown of a stream or exit watch whose handler failed."""
+        if isinstance(data, _ExitWatch):
+            fileobj, fd = data.pidfd, data.pidfd
+        else:
+            self._unflushed.discard(data)
+            fileobj, fd = data.stream, data.log_fd
+        try:
+            self._selector.unregister(fileobj)
+        except (KeyError, ValueError):
+            pass  # Already unregistered
+        if not isinstance(data, _ExitWatch):
             try:
-                log_file.close()
+                data.stream.close()
             except Exception:
                 pass
+        if fd >= 0:  # -1 once the failing handler had closed it
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        # Let the crash monitor poll, in case this watch would have reported an exit
+        self._notify_exit()
+
+    def _flush_log(self, output: _OutputStream, now: float):
+        try:
+            _write_all(output.log_fd, output.pending)
+        except OSError as e:
+            logger.error(f"Error writing log for {output.service_name}: {e}")
+        output.pending = []
+        output.unflushed = 0
+        output.last_flush = now
+        self._unflushed.discard(output)
+
+    def _read_stream(self, output: _OutputStream):
+        """Read what is available on a pipe and dispatch the complete lines."""
+        try:
+            chunk = os.read(output.stream.fileno(), READ_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.error(f"Error in log capture for {output.service_name}: {e}")
+            chunk = b""
+
+        if not chunk:
+            self._close_stream(output)
+            return
+
+        lines = (output.buffer + chunk).split(b"\n")
+        output.buffer = lines.pop()
+        self._write_lines(output, lines)
+
+    def _write_lines(self, output: _OutputStream, lines: list[bytes]):
+        """Queue lines for the log file; pending reads go out in one writev()."""
+        # Entries are built from the raw bytes; lines from one read share a timestamp
+        prefix = f"[{datetime.now().isoformat()}] ".encode()
+        listening = self._on_log_batch or self._on_log
+        entries = []
+        records = []
+        for line in lines:
+            line = line.rstrip()
+            if line:
+                entries += (prefix, line, b"\n")
+                if listening:
+                    records.append(self._classify_line(output, line))
+        if records:
+            self._dispatch_records(output.service_name, records)
+        if not entries:
+            return
+        data = b"".join(entries)
+        output.pending.append(data)
+        output.unflushed += len(data)
+        if output.unflushed >= LOG_FLUSH_BYTES or len(output.pending) >= LOG_FLUSH_CHUNKS:
+            self._flush_log(output, time.monotonic())
+        else:
+            self._unflushed.add(output)
+
+    def _classify_line(self, output: _OutputStream, line: bytes) -> tuple[str, str, str]:
+        """Decode a line of process output and detect its level from the content."""
+        decoded = line.decode("utf-8", errors="replace")
+        detected_level = output.level
+        lower = decoded.lower()
+        if "error" in lower or "exception" in lower or "traceback" in lower:
+            detected_level = "error"
+        elif "warn" in lower:  # Also covers "warning"
+            detected_level = "warning"
+        return output.service_name, detected_level, decoded
+
+    def _dispatch_records(self, service_name: str, records: list[tuple[str, str, str]]):
+        """Hand one read's log records to the batch callback, or line by line."""
+        try:
+            if self._on_log_batch:
+                self._on_log_batch(records)
+            else:
+                for record in records:
+                    self._on_log(*record)
+        except Exception as e:
+            logger.error(f"Error processing log lines for {service_name}: {e}")
+
+    def _close_stream(self, output: _OutputStream):
+        """Stop watching a pipe at EOF; stdout's EOF also reports the process exit.
+
+        The crash monitor is woken unless the exit was requested via stop().
+        """
+        self._selector.unregister(output.stream)
+        if output.buffer:
+            self._write_lines(output, [output.buffer])
+            output.buffer = b""
+        self._flush_log(output, time.monotonic())
+        try:
+            output.stream.close()
+        except Exception:
+            pass
+        os.close(output.log_fd)
+        output.log_fd = -1
+
+        process = output.process
+        if process is None or output.stop_event.is_set():
+            return
+        if process.poll() is None:
+            # Pipe closed just ahead of the exit; reap off the reader thread
+            threading.Thread(
+                target=self._await_exit, args=(process, output.stop_event), daemon=True
+            ).start()
+        else:
+            self._notify_exit()
+
+    def _handle_exit(self, watch: _ExitWatch):
+        """Reap an exited service and wake the crash monitor, unless stop() asked for it."""
+        self._selector.unregister(watch.pidfd)
+        os.close(watch.pidfd)
+        watch.pidfd = -1
+        watch.process.wait()  # Already exited; just reap
+        if not watch.stop_event.is_set():
+            self._notify_exit()
+
+    def _await_exit(self, process: subprocess.Popen, stop_event: threading.Event):
+        """Wait for a process whose stdout has closed, then wake the crash monitor."""
+        process.wait()
+        if not stop_event.is_set():
+            self._notify_exit()
 
     async def check_and_restart_crashed(self):
         """Check for crashed processes and restart them."""
-        with self._lock:
-            crashed = [
-                name
-                for name, info in self._processes.items()
-                if info.process.poll() is not None
-            ]
+        crashed = [
+            name
+            for name, info in self._processes.items()
+            if info.process.poll() is not None
+        ]
 
         for service_name in crashed:
             logger.warning(f"Service {service_name} has crashed, attempting restart")
@@ -275,48 +622,88 @@ class ProcessManager:
                 service = Service.get(Service.name == service_name)
                 if not service.enabled:
                     logger.info(f"Service {service_name} is disabled, not restarting")
-                    with self._lock:
-                        del self._processes[service_name]
+                    self._remove_processes(service_name)
                     continue
 
                 # Check restart count
-                with self._lock:
-                    info = self._processes.get(service_name)
-                    if info and info.restart_count >= config.max_restart_attempts:
-                        logger.error(
-                            f"Service {service_name} exceeded max restart attempts, giving up"
-                        )
-                        del self._processes[service_name]
-                        continue
-
-                # Restart with backoff
-                with self._lock:
-                    if service_name in self._processes:
-                        del self._processes[service_name]
-
-                await asyncio.sleep(config.restart_delay)
-
-                if self.start(service):
-                    with self._lock:
-                        if service_name in self._processes:
-                            self._processes[service_name].restart_count = (
-                                info.restart_count + 1 if info else 1
-                            )
-                            self._processes[service_name].last_restart = datetime.now()
+                info = self._processes.get(service_name)
+                if info and info.restart_count >= config.max_restart_attempts:
+                    logger.error(
+                        f"Service {service_name} exceeded max restart attempts, giving up"
+                    )
+                    self._remove_processes(service_name)
+                    continue
+
+                # Restart with exponential backoff; crashed services restart concurrently
+                self._remove_processes(service_name)
+
+                restart_count = info.restart_count if info else 0
+                delay = min(config.max_restart_backoff, config.restart_delay * 2**restart_count)
+                self.cancel_restart(service_name)
+                task = asyncio.create_task(self._restart_crashed(service_name, restart_count, delay))
+                self._restart_tasks[service_name] = task
+                task.add_done_callback(
+                    lambda t, name=service_name: self._restart_tasks.get(name) is t
+                    and self._restart_tasks.pop(name, None)
+                )
 
             except Service.DoesNotExist:
                 logger.error(f"Service {service_name} not found in database")
-                with self._lock:
-                    if service_name in self._processes:
-                        del self._processes[service_name]
-
-    def shutdown_all(self):
-        """Stop all running processes."""
+                self._remove_processes(service_name)
+
+    async def _restart_crashed(self, service_name: str, restart_count: int, delay: float):
+        """Start a crashed service again after its backoff delay.
+
+        The row is re-read after the wait, so a service deleted or disabled in
+        the meantime stays down and an edited one starts with its new config.
+        """
+        await asyncio.sleep(delay)
+        service = await asyncio.to_thread(Service.get_or_none, Service.name == service_name)
+        if service is None or not service.enabled:
+            logger.info(f"Service {service_name} was removed or disabled, not restarting")
+            return
+        async with self._restart_slots:
+            started = await asyncio.to_thread(self.start, service)
+        if started:
+            info = self._processes.get(service.name)
+            if info:
+                info.restart_count = restart_count + 1
+                info.last_restart = datetime.now()
+
+    def shutdown_all(self, timeout: int = 10):
+        """Stop all running processes.
+
+        Every process group gets SIGTERM first and they are all waited on
+        together, so shutdown takes the slowest stop rather than the sum.
+        """
+        for name in list(self._restart_tasks):
+            self.cancel_restart(name)
+
+        infos = self._processes
+        with self._lock:
+            for name in infos:
+                if name in self._stop_events:
+                    self._stop_events[name].set()
+
+        processes = [info.process for info in infos.values()]
+        for process in processes:
+            _signal_group(process, signal.SIGTERM)
+
+        survivors = _wait_all_exit(processes, timeout)
+        if survivors:
+            logger.warning(f"{len(survivors)} service(s) did not stop gracefully, forcing kill")
+            for process in survivors:
+                _signal_group(process, signal.SIGKILL)
+            for process in _wait_all_exit(survivors, 5):
+                logger.error(f"Process {process.pid} did not exit after SIGKILL")
+
+        self._remove_processes(*infos)
         with self._lock:
-            service_names = list(self._processes.keys())
+            for name in infos:
+                self._stop_events.pop(name, None)
 
-        for name in service_names:
-            self.stop(name)
+        for name in infos:
+            logger.info(f"Stopped service {name}")
 
 
 # Global process manager instance
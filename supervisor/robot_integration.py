@@ -8,20 +8,180 @@ populated with existing service/port context so the AI avoids conflicts.
 """
 
 import asyncio
-import json
+import functools
+import inspect
 import logging
-import subprocess
+import os
+import signal
+import time
 from pathlib import Path
 from typing import AsyncIterator, Optional
 
+import orjson
+
+from .jobs import ai_slots
+
 logger = logging.getLogger(__name__)
 
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 CODE_DIR = Path.home() / "Code"
+STREAM_LINE_LIMIT = 1 << 20  # Max bytes per line of streamed robot output
+READ_CHUNK_SIZE = 65536  # Bytes per read of robot scan output
+SERVICES_CONTEXT_TTL = 2.0  # Seconds the services summary is reused; the API also invalidates it
+
+_services_context: tuple[float, str] | None = None  # (expires, summary)
+
+
+def invalidate_services_context():
+    """Drop the cached services summary after a service is added, changed or removed."""
+    global _services_context
+    _services_context = None
+
+
+def _single_flight(func):
+    """Share one run of an async function among concurrent calls with the same arguments.
+
+    Callers that arrive while a run is in flight await its result instead of
+    starting another robot process; a caller being cancelled leaves the run going.
+    """
+    signature = inspect.signature(func)
+    inflight: dict[tuple, asyncio.Task] = {}
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.items())
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+async def _start_robot(args: list[str]) -> asyncio.subprocess.Process:
+    """Start the robot CLI in its own process group, with piped output."""
+    return await asyncio.create_subprocess_exec(
+        "robot",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+
+
+async def _kill_robot(process: asyncio.subprocess.Process):
+    """Kill a robot run's whole process group and reap it.
+
+    Children go too, since they would hold the pipes (and so wait()) open.
+    """
+    if process.returncode is None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+
+async def _run_robot(args: list[str], timeout: float) -> tuple[int, bytes, bytes]:
+    """Run the robot CLI and collect (returncode, stdout, stderr).
+
+    The run is killed if it outlives timeout; raises asyncio.TimeoutError.
+    """
+    async with ai_slots:
+        process = await _start_robot(args)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except BaseException:  # Timed out or cancelled
+            await _kill_robot(process)
+            raise
+    return process.returncode, stdout, stderr
+
+
+class _JSONObjectFinder:
+    """Finds the first parseable top-level JSON object in output as it arrives.
+
+    Tracks brace depth outside of strings, so the object is parsed the moment
+    its closing brace is read; text before and after it is skipped.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.error: orjson.JSONDecodeError | None = None  # Last candidate that failed to parse
+        self._pos = 0
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: bytes) -> dict | None:
+        """Add output; returns the object once one is complete."""
+        buf = self.buffer
+        buf += chunk
+        i, n = self._pos, len(buf)
+        while i < n:
+            if self._depth == 0:
+                i = buf.find(b"{", i)
+                if i == -1:
+                    i = n
+                    break
+                self._start, self._depth = i, 1
+            else:
+                c = buf[i]
+                if self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif c == 0x5C:  # backslash
+                        self._escape = True
+                    elif c == 0x22:  # quote
+                        self._in_string = False
+                elif c == 0x22:
+                    self._in_string = True
+                elif c == 0x7B:  # {
+                    self._depth += 1
+                elif c == 0x7D:  # }
+                    self._depth -= 1
+                    if self._depth == 0:
+                        try:
+                            obj = orjson.loads(buf[self._start : i + 1])
+                        except orjson.JSONDecodeError as e:
+                            # Not JSON after all; look for an object after this brace
+                            self.error = e
+                            i = self._start
+                        else:
+                            self._pos = i + 1
+                            return obj
+            i += 1
+        self._pos = i
+        return None
+
+
+async def _read_scan_result(stream: asyncio.StreamReader, finder: _JSONObjectFinder) -> dict | None:
+    """Feed stream output to finder until it yields an object or the stream ends."""
+    while chunk := await stream.read(READ_CHUNK_SIZE):
+        obj = finder.feed(chunk)
+        if obj is not None:
+            return obj
+    return None
 
 
 def get_existing_services_context() -> str:
     """Build a summary of currently registered services and their ports."""
+    global _services_context
+    now = time.monotonic()
+    cached = _services_context
+    if cached and cached[0] > now:
+        return cached[1]
+
+    summary = _build_services_context()
+    _services_context = (now + SERVICES_CONTEXT_TTL, summary)
+    return summary
+
+
+def _build_services_context() -> str:
     from .models import Service
 
     services = Service.select()
@@ -40,11 +200,24 @@ def get_existing_services_context() -> str:
     return "\n".join(lines)
 
 
+@functools.lru_cache(maxsize=8)
+def _read_template(path: Path, mtime_ns: int) -> str:
+    return path.read_text()
+
+
+def _load_template(name: str, kind: str) -> str:
+    """Read a prompt template, cached until the file's mtime changes."""
+    path = PROMPTS_DIR / name
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{kind} prompt template not found: {path}") from None
+    return _read_template(path, mtime_ns)
+
+
 def get_onboard_prompt(project_path: str, project_name: str, port: int = None) -> str:
     """Load and format the onboard prompt template with live service context."""
-    template_path = PROMPTS_DIR / "onboard.md"
-    if not template_path.exists():
-        raise FileNotFoundError(f"Onboard prompt template not found: {template_path}")
+    template = _load_template("onboard.md", "Onboard")
 
     if port:
         requested_port = f"- Requested port: {port}"
@@ -56,7 +229,6 @@ def get_onboard_prompt(project_path: str, project_name: str, port: int = None) -
             "If the project has a default port that is already taken, pick the next available port."
         )
 
-    template = template_path.read_text()
     return template.format(
         project_path=project_path,
         project_name=project_name,
@@ -90,6 +262,7 @@ def resolve_project_path(project: str) -> tuple[str, str]:
     return str(project_path), project_name
 
 
+@_single_flight
 async def run_robot_onboard(
     project: str,
     model: str = "opus",
@@ -113,33 +286,29 @@ async def run_robot_onboard(
 
     try:
         # Run robot with the onboard prompt
-        result = await asyncio.to_thread(
-            subprocess.run,
+        returncode, stdout, stderr = await _run_robot(
             [
-                "robot",
                 "run",
                 "-m", model,
                 "-d", project_path,
                 "-t", "600",  # 10 minute timeout
                 prompt,
             ],
-            capture_output=True,
-            text=True,
             timeout=660,
         )
 
-        success = result.returncode == 0
-        output = result.stdout if success else result.stderr
+        success = returncode == 0
+        stderr = stderr.decode("utf-8", errors="replace")
 
         return {
             "success": success,
             "project_name": project_name,
             "project_path": project_path,
-            "output": output,
-            "error": result.stderr if not success else None,
+            "output": stdout.decode("utf-8", errors="replace") if success else stderr,
+            "error": stderr if not success else None,
         }
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         return {
             "success": False,
             "project_name": project_name,
@@ -160,11 +329,7 @@ async def run_robot_onboard(
 
 def get_security_scan_prompt(service_name: str, service_url: str, port: int) -> str:
     """Load and format the security scan prompt template."""
-    template_path = PROMPTS_DIR / "security_scan.md"
-    if not template_path.exists():
-        raise FileNotFoundError(f"Security scan prompt template not found: {template_path}")
-
-    template = template_path.read_text()
+    template = _load_template("security_scan.md", "Security scan")
     return template.format(
         service_name=service_name,
         service_url=service_url,
@@ -172,6 +337,7 @@ def get_security_scan_prompt(service_name: str, service_url: str, port: int) ->
     )
 
 
+@_single_flight
 async def run_security_scan(
     service_name: str,
     service_url: str,
@@ -195,60 +361,63 @@ async def run_security_scan(
     logger.info(f"Running security scan: {service_name} at {service_url}")
 
     try:
-        result = await asyncio.to_thread(
-            subprocess.run,
-            [
-                "robot",
-                "run",
-                "-m", model,
-                "-t", "300",  # 5 minute timeout
-                prompt,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=360,
-        )
+        # Parse JSON from output as it streams - robot may include other text.
+        # The run is ended as soon as the results object is complete.
+        finder = _JSONObjectFinder()
+        async with ai_slots:
+            process = await _start_robot(
+                [
+                    "run",
+                    "-m", model,
+                    "-t", "300",  # 5 minute timeout
+                    prompt,
+                ]
+            )
+            stderr_task = asyncio.create_task(process.stderr.read())
+            try:
+                scan_results = await asyncio.wait_for(
+                    _read_scan_result(process.stdout, finder), timeout=360
+                )
+            except BaseException:  # Timed out or cancelled
+                await _kill_robot(process)
+                raise
+            if scan_results is not None:
+                await _kill_robot(process)  # Done with it, even if it is still writing
+            else:
+                await process.wait()  # Plain EOF; let the real exit status decide
+            stderr = await stderr_task
+
+        if scan_results is not None:
+            scan_results["success"] = True
+            return scan_results
 
-        if result.returncode != 0:
+        if process.returncode != 0:
             return {
                 "success": False,
                 "service_name": service_name,
                 "url": service_url,
-                "error": result.stderr or "Security scan failed",
+                "error": stderr.decode("utf-8", errors="replace") or "Security scan failed",
             }
 
-        # Parse JSON from output - robot may include other text
-        output = result.stdout.strip()
-
-        # Try to extract JSON from the output
-        json_start = output.find("{")
-        json_end = output.rfind("}") + 1
-
-        if json_start != -1 and json_end > json_start:
-            json_str = output[json_start:json_end]
-            try:
-                scan_results = json.loads(json_str)
-                scan_results["success"] = True
-                return scan_results
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse scan results JSON: {e}")
-                return {
-                    "success": False,
-                    "service_name": service_name,
-                    "url": service_url,
-                    "error": f"Failed to parse scan results: {e}",
-                    "raw_output": output,
-                }
-        else:
+        output = bytes(finder.buffer).strip().decode("utf-8", errors="replace")
+        if finder.error is not None:
+            logger.error(f"Failed to parse scan results JSON: {finder.error}")
             return {
                 "success": False,
                 "service_name": service_name,
                 "url": service_url,
-                "error": "No JSON found in scan output",
+                "error": f"Failed to parse scan results: {finder.error}",
                 "raw_output": output,
             }
+        return {
+            "success": False,
+            "service_name": service_name,
+            "url": service_url,
+            "error": "No JSON found in scan output",
+            "raw_output": output,
+        }
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         return {
             "success": False,
             "service_name": service_name,
@@ -265,6 +434,25 @@ async def run_security_scan(
         }
 
 
+async def _read_line(reader: asyncio.StreamReader) -> bytes:
+    """Read one line, however long; returns b"" at EOF.
+
+    Lines longer than the reader's limit are collected in pieces and joined
+    once, rather than regrowing a buffer.
+    """
+    parts = []
+    while True:
+        try:
+            parts.append(await reader.readuntil(b"\n"))
+            break
+        except asyncio.LimitOverrunError as e:
+            parts.append(await reader.readexactly(e.consumed))
+        except asyncio.IncompleteReadError as e:
+            parts.append(e.partial)
+            break
+    return b"".join(parts)
+
+
 async def stream_robot_chat(
     message: str,
     project: Optional[str] = None,
@@ -303,36 +491,27 @@ async def stream_robot_chat(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LINE_LIMIT,
         )
 
         # Stream stdout
         async def read_stream():
-            buffer = ""
             while True:
-                chunk = await process.stdout.read(1024)
-                if not chunk:
+                raw = await _read_line(process.stdout)
+                if not raw:
                     break
 
-                text = chunk.decode("utf-8", errors="replace")
-                buffer += text
-
                 # Try to parse JSON lines (robot streams JSON events)
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        event = json.loads(line)
-                        yield event
-                    except json.JSONDecodeError:
-                        # Plain text output
-                        yield {"type": "text", "content": line}
-
-            # Remaining buffer
-            if buffer.strip():
-                yield {"type": "text", "content": buffer.strip()}
+                line = raw.strip()
+                if not line:
+                    continue
+
+                try:
+                    event = orjson.loads(line)
+                    yield event
+                except orjson.JSONDecodeError:
+                    # Plain text output
+                    yield {"type": "text", "content": line.decode("utf-8", errors="replace")}
 
         async for event in read_stream():
             yield event